@@ -1,4 +1,5 @@
 import pdfplumber
+from pdf_parser import PDFParser
 
 def analyze_pdf(pdf_path):
     try:
@@ -13,6 +14,13 @@ def analyze_pdf(pdf_path):
                     else:
                         f.write("[No text found]\n")
                     f.write("----------------\n")
+                    page.close()
+
+        # Root of every page, streamed over a single open document
+        with open("analysis_output.txt", "a", encoding="utf-8") as f:
+            f.write("--- Roots ---\n")
+            for page_num, root, _ in PDFParser(pdf_path).iter_roots():
+                f.write(f"Page {page_num + 1}: {root}\n")
     except Exception as e:
         with open("analysis_output.txt", "w", encoding="utf-8") as f:
             f.write(f"Error reading PDF: {e}")
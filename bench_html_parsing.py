@@ -0,0 +1,61 @@
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+import html_parsing
+
+# Ensure UTF-8 output
+sys.stdout.reconfigure(encoding='utf-8')
+
+# (fixture, strainer, what the scraper extracts from the parsed tree)
+# tatoeba_debug.html is not a case: it is the empty search page (no sentence-and-translations),
+# so it would only time parsing a page the strainer rejects entirely
+CASES = [
+    ("pealim.html", html_parsing.PEALIM_RESULTS, lambda soup: soup.find_all('div', class_='verb-search-result')),
+    ("pealim_detail.html", html_parsing.PEALIM_HEADINGS, lambda soup: soup.find_all(['h2', 'h3', 'h4'])),
+]
+
+def full_parse(html, strainer, extract):
+    # What the scrapers used to do: build the whole tree with html.parser, then search it
+    return extract(BeautifulSoup(html, 'html.parser'))
+
+def strained_parse(html, strainer, extract):
+    return extract(html_parsing.make_soup(html, strainer))
+
+def measure(func, html, strainer, extract, repeat=5):
+    best = min(_timed(func, html, strainer, extract) for _ in range(repeat))
+    tracemalloc.start()
+    result = func(html, strainer, extract)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, [tag.get_text(strip=True) for tag in result]
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    print(f"Backend: {html_parsing.PARSER}")
+    mismatches = 0
+    empty = 0
+    for file_path, strainer, extract in CASES:
+        with open(file_path, "r", encoding="utf-8") as f:
+            html = f.read()
+        old_time, old_peak, old_result = measure(full_parse, html, strainer, extract)
+        new_time, new_peak, new_result = measure(strained_parse, html, strainer, extract)
+        if old_result != new_result:
+            mismatches += 1
+        if not old_result:
+            # Nothing extracted: the comparison and the timings would be meaningless
+            print(f"No matches in {file_path}: the fixture or the selector is out of date")
+            empty += 1
+        print(f"--- {file_path} ({len(html) // 1024} KB, {len(new_result)} matches) ---")
+        print(f"Full html.parser: {old_time * 1000:7.2f} ms, peak {old_peak / 1024:8.0f} KB")
+        print(f"Strained:         {new_time * 1000:7.2f} ms, peak {new_peak / 1024:8.0f} KB")
+        print(f"Speedup: {old_time / new_time:.2f}x, memory: {old_peak / new_peak:.2f}x less")
+    print(f"Mismatches: {mismatches}")
+    if mismatches or empty:
+        sys.exit(1)
@@ -0,0 +1,66 @@
+import json
+import re
+import sys
+import timeit
+import unicodedata
+
+from pdf_parser_legacy import PDFParser
+
+# Ensure UTF-8 output
+sys.stdout.reconfigure(encoding='utf-8')
+
+HEBREW_RUN = re.compile(r'[\u0590-\u05FF\uFB1D-\uFB4F\s"]+')
+
+def reverse_hebrew_reference(text):
+    """The previous cluster-by-concatenation implementation, kept for comparison."""
+    clusters = []
+    current_cluster = ""
+    text = text.strip()
+    for char in text:
+        if unicodedata.combining(char):
+            if current_cluster and current_cluster[-1].isspace():
+                current_cluster = current_cluster.rstrip()
+            current_cluster += char
+        else:
+            if current_cluster:
+                clusters.append(current_cluster)
+            current_cluster = char
+    if current_cluster:
+        clusters.append(current_cluster)
+    reversed_text = "".join(reversed(clusters))
+    reversed_text = re.sub(r'\s{2,}', ' ', reversed_text)
+    return reversed_text.strip()
+
+def load_samples():
+    """Hebrew runs from the captured extraction output, as reverse_hebrew sees them."""
+    samples = []
+    with open("analysis_output.txt", encoding="utf-8") as f:
+        for line in f:
+            samples.extend(m for m in HEBREW_RUN.findall(line) if m.strip())
+    with open("debug_output.json", encoding="utf-8") as f:
+        data = json.load(f)
+    samples.append(data["root"])
+    for word in data["words"]:
+        samples.append(word["hebrew_vocalized"])
+        samples.append(word["hebrew_plain"])
+    return samples
+
+def bench(func, samples, repeat=5, number=200):
+    best = min(timeit.repeat(lambda: [func(s) for s in samples], repeat=repeat, number=number))
+    return best / (number * len(samples))
+
+if __name__ == "__main__":
+    parser = PDFParser("roots.pdf")
+    samples = load_samples()
+
+    mismatches = [s for s in samples if parser.reverse_hebrew(s) != reverse_hebrew_reference(s)]
+    print(f"Samples: {len(samples)} ({sum(len(s) for s in samples)} chars)")
+    print(f"Mismatches vs reference: {len(mismatches)}")
+
+    old = bench(reverse_hebrew_reference, samples)
+    new = bench(parser.reverse_hebrew, samples)
+    print(f"Reference:    {old * 1e6:.2f} us/call")
+    print(f"Single-pass:  {new * 1e6:.2f} us/call")
+    print(f"Speedup:      {old / new:.2f}x")
+    if mismatches:
+        sys.exit(1)
@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from bench_suite import BASELINE_FILE, TOLERANCE, percentile
+
+# Ensure UTF-8 output
+sys.stdout.reconfigure(encoding='utf-8')
+
+# Stored in the bench_suite baseline file under this name
+STAGE = "startup_import_main"
+RUNS = 10
+
+def import_times(module="main"):
+    """
+    Imports `module` in a fresh interpreter with -X importtime.
+    Returns {module and everything it imported: cumulative microseconds}.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package", children listed before their parent
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+        if not name.startswith("  "):
+            # A top-level import finished: keep it only if it is the module being measured
+            if name.strip() == module:
+                return times
+            times = {}
+    return times
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Measure the import time of main.py with -X importtime.")
+    arg_parser.add_argument("--runs", type=int, default=RUNS)
+    arg_parser.add_argument("--baseline", default=BASELINE_FILE)
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed p50 slowdown (0.5 = 50%%)")
+    args = arg_parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    samples = [times["main"] / 1e6 for times in runs]
+    stats = {
+        "n": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+    }
+
+    print(f"import main: p50 {stats['p50'] * 1000:.1f} ms, p95 {stats['p95'] * 1000:.1f} ms ({args.runs} runs)")
+    print("Slowest imports (cumulative, last run):")
+    slowest = sorted(((n, t) for n, t in runs[-1].items() if n != "main"), key=lambda item: item[1], reverse=True)[:10]
+    for name, us in slowest:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.save_baseline:
+        baseline[STAGE] = stats
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif STAGE in baseline:
+        base = baseline[STAGE]["p50"]
+        print(f"Baseline p50 {base * 1000:.1f} ms ({stats['p50'] / base:.2f}x)")
+        if stats["p50"] > base * (1 + args.tolerance):
+            print(f"Startup regressed beyond {args.tolerance:.0%}")
+            sys.exit(1)
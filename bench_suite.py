@@ -0,0 +1,282 @@
+import argparse
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import sample_pdf
+
+# Ensure UTF-8 output
+sys.stdout.reconfigure(encoding='utf-8')
+
+BASELINE_FILE = "bench_baseline.json"
+# A stage fails when its p50 is more than this fraction slower than the baseline
+TOLERANCE = 0.5
+SAMPLE_PAGES = 60
+HISTORY_SIZE = 10000
+
+# Gemini-shaped words used for the stubbed model and for format_message
+STUB_WORDS = [
+    {
+        "hebrew": "לַהֲפוֹךְ",
+        "transliteration": "lahafoch",
+        "type": "Verb - Pa'al",
+        "translation": "to turn over, to turn into",
+        "example": {"hebrew": "הוא הפך את הדף.", "english": "He turned the page."}
+    }
+] * 10
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+class StubModel:
+    """Stands in for genai.GenerativeModel: answers instantly with a fixed word list."""
+    model_name = "models/stub"
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        text = json.dumps(STUB_WORDS, ensure_ascii=False)
+        if not stream:
+            return StubResponse(text)
+        # Streamed like the API: a handful of arbitrary-sized text chunks
+        size = len(text) // 8 + 1
+        return [StubResponse(text[i:i + size]) for i in range(0, len(text), size)]
+
+class StubHttpResponse:
+    status_code = 200
+
+    def json(self):
+        return {"ok": True}
+
+class StubSession:
+    """Stands in for the Telegram requests.Session."""
+    def post(self, url, json=None, timeout=None):
+        return StubHttpResponse()
+
+def timed(func, iterations):
+    """Runs func `iterations` times, returning each call's duration in seconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def synthetic_roots(count):
+    letters = sample_pdf.LETTERS
+    roots = (".".join(p) for p in itertools.product(letters, repeat=3))
+    return list(itertools.islice(roots, count))
+
+# --- Stages: each returns a list of per-operation durations ---
+
+def bench_parse_page(ctx):
+    from pdf_parser import PDFParser
+    parser = PDFParser(ctx["pdf"])
+    return [s for page_num in range(SAMPLE_PAGES) for s in timed(lambda: parser.parse_page(page_num), 1)]
+
+def bench_parse_page_legacy(ctx):
+    from pdf_parser_legacy import PDFParser
+    parser = PDFParser(ctx["pdf"])
+    return [s for page_num in range(SAMPLE_PAGES) for s in timed(lambda: parser.parse_page(page_num), 1)]
+
+def bench_parse_page_layout(ctx):
+    from pdf_parser_legacy import PDFParser
+    parser = PDFParser(ctx["pdf"], layout=True)
+    has_content = [bool(items) for items in sample_pdf.sample_pages(SAMPLE_PAGES)]
+    samples = []
+    for page_num in range(SAMPLE_PAGES):
+        start = time.perf_counter()
+        data = parser.parse_page(page_num)
+        samples.append(time.perf_counter() - start)
+        # parse_page swallows errors, so a page that stopped parsing (e.g. on a ligature) must fail the run
+        if has_content[page_num] and not (data and data["root"]):
+            raise RuntimeError(f"layout mode failed to parse sample page {page_num + 1}")
+    return samples
+
+def bench_extract_document(ctx):
+    from extraction import extract_document
+    return timed(lambda: extract_document(ctx["pdf"]), 5)
+
+def bench_reverse_hebrew(ctx):
+    from pdf_parser_legacy import PDFParser
+    from bench_reverse_hebrew import load_samples
+    parser = PDFParser(ctx["pdf"])
+    samples = load_samples()
+    # One sample per pass over the corpus, normalised to a single call
+    return [s / len(samples) for s in timed(lambda: [parser.reverse_hebrew(t) for t in samples], 50)]
+
+def bench_html_parsing(ctx):
+    from sources import PealimSource
+    import html_parsing
+    fixtures = []
+    # Only fixtures the parsers find results in (tatoeba_debug.html is an empty search page)
+    for file_path, parse in (("pealim.html", PealimSource(None).parse),
+                             ("pealim_detail.html", html_parsing.pealim_headings)):
+        with open(file_path, "r", encoding="utf-8") as f:
+            fixtures.append((parse, f.read()))
+    return [s for parse, html in fixtures for s in timed(lambda: parse(html), 10)]
+
+def _json_state(ctx, roots):
+    from state_manager import StateManager
+    path = os.path.join(ctx["tmp"], "history.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"used_roots": roots, "used_pages": list(range(len(roots)))}, f, ensure_ascii=False)
+    return StateManager(path)
+
+def _sqlite_state(ctx):
+    from state_manager import SQLiteStateManager, migrate_history
+    db_path = os.path.join(ctx["tmp"], "history.db")
+    migrate_history(os.path.join(ctx["tmp"], "history.json"), db_path)
+    return SQLiteStateManager(db_path)
+
+def _state_lookups(state, roots):
+    # Hits spread over the history plus a miss
+    probes = itertools.cycle(roots[::97] + ["ז.ז.ז.ז"])
+    return timed(lambda: state.is_root_used(next(probes)), 2000) + timed(state.get_last_page, 200)
+
+def _state_writes(state, roots):
+    new_roots = iter(f"{r}.א" for r in roots)
+    return timed(lambda: state.mark_used(next(new_roots), HISTORY_SIZE + 1), 20)
+
+def bench_state_json_lookup(ctx):
+    roots = synthetic_roots(HISTORY_SIZE)
+    return _state_lookups(_json_state(ctx, roots), roots)
+
+def bench_state_json_mark_used(ctx):
+    roots = synthetic_roots(HISTORY_SIZE)
+    return _state_writes(_json_state(ctx, roots), roots)
+
+def _with_sqlite_state(ctx, ops):
+    roots = synthetic_roots(HISTORY_SIZE)
+    _json_state(ctx, roots)
+    state = _sqlite_state(ctx)
+    try:
+        return ops(state, roots)
+    finally:
+        state.close()
+        os.remove(os.path.join(ctx["tmp"], "history.db"))
+
+def bench_state_sqlite_lookup(ctx):
+    return _with_sqlite_state(ctx, _state_lookups)
+
+def bench_state_sqlite_mark_used(ctx):
+    return _with_sqlite_state(ctx, _state_writes)
+
+def bench_format_message(ctx):
+    from main import format_message
+    return timed(lambda: format_message("ה.פ.כ", STUB_WORDS), 2000)
+
+def bench_enrich_stub(ctx):
+    from enricher import Enricher
+    from llm_metrics import LLMMetrics
+    from response_cache import ResponseCache
+    os.environ.pop("GEMINI_API_KEY", None)
+    enricher = Enricher(
+        cache=ResponseCache(os.path.join(ctx["tmp"], "enrich_cache.json")),
+        model_cache=ResponseCache(os.path.join(ctx["tmp"], "model_cache.json")),
+        metrics=LLMMetrics(os.path.join(ctx["tmp"], "llm_metrics.jsonl"))
+    )
+    enricher.model = StubModel()
+    roots = itertools.cycle(synthetic_roots(50))
+    # refresh=True so every call runs prompt -> response parsing -> cache write
+    return timed(lambda: enricher.get_words_for_root(next(roots), refresh=True), 200)
+
+def bench_telegram_stub(ctx):
+    from telegram_delivery import TelegramDelivery
+    from main import format_message
+    msg = format_message("ה.פ.כ", STUB_WORDS)
+    chat_ids = [str(i) for i in range(5)]
+    # A fresh delivery per run so the per-chat rate limit does not throttle the benchmark
+    return timed(lambda: TelegramDelivery("stub", session=StubSession()).broadcast(chat_ids, msg), 50)
+
+STAGES = {
+    "parse_page": bench_parse_page,
+    "parse_page_legacy": bench_parse_page_legacy,
+    "parse_page_layout": bench_parse_page_layout,
+    "extract_document": bench_extract_document,
+    "reverse_hebrew": bench_reverse_hebrew,
+    "html_parsing": bench_html_parsing,
+    "state_json_lookup": bench_state_json_lookup,
+    "state_json_mark_used": bench_state_json_mark_used,
+    "state_sqlite_lookup": bench_state_sqlite_lookup,
+    "state_sqlite_mark_used": bench_state_sqlite_mark_used,
+    "format_message": bench_format_message,
+    "enrich_stub": bench_enrich_stub,
+    "telegram_stub": bench_telegram_stub,
+}
+
+def summarize(samples):
+    return {
+        "n": len(samples),
+        "ops_per_sec": len(samples) / sum(samples) if sum(samples) else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+    }
+
+def run(stage_names):
+    # Time the stages themselves, not the telemetry file writes
+    os.environ["TELEMETRY_FILE"] = ""
+    tmp = tempfile.mkdtemp(prefix="bench-")
+    ctx = {"tmp": tmp, "pdf": sample_pdf.generate(os.path.join(tmp, "sample.pdf"), SAMPLE_PAGES)}
+    results = {}
+    try:
+        for name in stage_names:
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = summarize(STAGES[name](ctx))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+def compare(results, baseline, tolerance):
+    """Returns the stages whose p50 regressed beyond the tolerance."""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base and stats["p50"] > base["p50"] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark every pipeline stage against a stored baseline.")
+    arg_parser.add_argument("stages", nargs="*", help=f"Stages to run (default: all): {', '.join(STAGES)}")
+    arg_parser.add_argument("--baseline", default=BASELINE_FILE)
+    arg_parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed p50 slowdown (0.5 = 50%%)")
+    args = arg_parser.parse_args()
+    unknown = [name for name in args.stages if name not in STAGES]
+    if unknown:
+        arg_parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    results = run(args.stages or list(STAGES))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"{'Stage':<24}{'n':>6}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'vs base':>10}")
+    for name, stats in results.items():
+        base = baseline.get(name)
+        change = f"{stats['p50'] / base['p50']:.2f}x" if base and base["p50"] else "-"
+        print(f"{name:<24}{stats['n']:>6}{stats['ops_per_sec']:>12.1f}{stats['p50'] * 1000:>10.3f}"
+              f"{stats['p95'] * 1000:>10.3f}{stats['p99'] * 1000:>10.3f}{change:>10}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    else:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
@@ -1,12 +1,108 @@
 import os
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+import hashlib
 import json
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rate_limit import TokenBucket, CircuitBreaker, backoff_delay
+from response_cache import ResponseCache
+from json_stream import JsonArrayStream
+from llm_metrics import LLMMetrics, TokenBudgetExceeded
+from telemetry import bind, span
+
+# Bump whenever the prompt changes so cached responses from the old prompt are not reused
+PROMPT_VERSION = 2
+
+# Declared response shape: Gemini returns exactly this JSON, with no markdown around it
+WORD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "hebrew": {"type": "string"},
+        "transliteration": {"type": "string"},
+        "type": {"type": "string"},
+        "translation": {"type": "string"},
+        "example": {
+            "type": "object",
+            "properties": {
+                "hebrew": {"type": "string"},
+                "english": {"type": "string"}
+            },
+            "required": ["hebrew", "english"]
+        }
+    },
+    "required": ["hebrew", "transliteration", "type", "translation", "example"]
+}
+WORDS_SCHEMA = {"type": "array", "items": WORD_SCHEMA}
+
+# Maximum number of roots packed into a single batched request
+BATCH_SIZE = 5
+
+# Prioritized list of preferences, also the fallback chain when the selected model fails
+# 1. Flash (Fast, Cheap/Free)
+# 2. Pro (Standard)
+# 3. Any other
+MODEL_PREFERENCES = [
+    'models/gemini-1.5-flash',
+    'models/gemini-1.5-flash-latest',
+    'models/gemini-1.5-flash-001',
+    'models/gemini-pro',
+    'models/gemini-1.0-pro'
+]
+
+# Older models reject JSON mode (response_mime_type / response_schema) with InvalidArgument: they get
+# the plain prompt, whose JSON the parsers find after any leading text or ```json fence
+NO_JSON_MODE = ('models/gemini-pro', 'models/gemini-1.0-pro')
+
+# Attempts per model for transient errors (429, 5xx, timeouts), with jittered exponential backoff
+GENERATE_ATTEMPTS = 3
+RETRY_BASE = 2.0
+RETRY_CAP = 30.0
+# Consecutive failures that open a model's circuit, and how long it then stays open (seconds)
+BREAKER_THRESHOLD = 3
+BREAKER_RESET = 300.0
+
+TRANSIENT_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    ConnectionError,
+    TimeoutError,
+)
+
+MODEL_CACHE_FILE = "model_cache.json"
+# How long a resolved model name is trusted before calling list_models again (seconds)
+MODEL_CACHE_TTL = 7 * 24 * 3600
 
 class Enricher:
-    def __init__(self):
+    def __init__(self, cache=None, model_cache=None, sources=None, metrics=None):
+        if cache is None:
+            ttl = os.environ.get("ENRICH_CACHE_TTL")
+            cache = ResponseCache(
+                max_entries=int(os.environ.get("ENRICH_CACHE_SIZE", 500)),
+                ttl=float(ttl) if ttl else None
+            )
+        self.cache = cache
+        if model_cache is None:
+            model_cache = ResponseCache(MODEL_CACHE_FILE, max_entries=8, ttl=MODEL_CACHE_TTL)
+        self.model_cache = model_cache
+        if metrics is None:
+            budget = os.environ.get("DAILY_TOKEN_BUDGET")
+            metrics = LLMMetrics(budget=int(budget) if budget else None)
+        self.metrics = metrics
+        # Dictionary sources are created on first lookup_word()
+        self.sources = sources
+        # Filled by list_models; None when the model name came from the cache
+        self.available_models = None
+        self.breakers = {}
+        self._models = {}
+
         # API Key should be in environment variable
         api_key = os.environ.get("GEMINI_API_KEY")
+        self.api_key = api_key
         if not api_key:
             # Fallback for local testing if not set? 
             # Or raise error. For now, bot might fail if not set, which is expected.
@@ -15,40 +111,48 @@ class Enricher:
         else:
             self.model = self._resolve_model(api_key)
 
-    def _resolve_model(self, api_key):
+    def _model_cache_key(self, api_key):
+        # Different keys may see different models; never store the key itself
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    def _resolve_model(self, api_key, use_cache=True):
         """
         Dynamically resolves the best available Gemini model.
         Logs available models for debugging.
+        The resolved name is cached for MODEL_CACHE_TTL so later runs skip list_models.
         """
+        genai.configure(api_key=api_key)
+        cache_key = self._model_cache_key(api_key)
+        if use_cache:
+            cached_name = self.model_cache.get(cache_key)
+            if cached_name:
+                print(f"Enricher: Using cached model '{cached_name}'")
+                return genai.GenerativeModel(cached_name)
+
         try:
             print("Enricher: Resolving available models...")
-            genai.configure(api_key=api_key)
-            all_models = [m for m in genai.list_models()]
+            with span("list_models"):
+                all_models = [m for m in genai.list_models()]
             content_models = [m.name for m in all_models if 'generateContent' in m.supported_generation_methods]
+            self.available_models = content_models
             
             print(f"Enricher: Available 'generateContent' models: {content_models}")
             
-            # Prioritized list of preferences
-            # 1. Flash (Fast, Cheap/Free)
-            # 2. Pro (Standard)
-            # 3. Any other
-            preferences = [
-                'models/gemini-1.5-flash',
-                'models/gemini-1.5-flash-latest',
-                'models/gemini-1.5-flash-001',
-                'models/gemini-pro',
-                'models/gemini-1.0-pro'
-            ]
-            
-            for pref in preferences:
+            selected = None
+            for pref in MODEL_PREFERENCES:
                 if pref in content_models:
                     print(f"Enricher: Selected preferred model '{pref}'")
-                    return genai.GenerativeModel(pref)
+                    selected = pref
+                    break
             
             # Fallback: Just take the first one available
-            if content_models:
+            if not selected and content_models:
                 print(f"Enricher: Fallback to first available model '{content_models[0]}'")
-                return genai.GenerativeModel(content_models[0])
+                selected = content_models[0]
+            
+            if selected:
+                self.model_cache.set(cache_key, selected)
+                return genai.GenerativeModel(selected)
             
             # Last resort if list is empty (shouldn't happen if key is valid)
             print("Enricher: No specific models found in list. Defaulting to 'gemini-pro'")
@@ -58,18 +162,152 @@ class Enricher:
             print(f"Enricher: Failed to list models ({e}). Defaulting to 'gemini-pro'.")
             return genai.GenerativeModel('gemini-pro')
 
-    def get_words_for_root(self, root):
+    def _breaker(self, model_name):
+        if model_name not in self.breakers:
+            self.breakers[model_name] = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_RESET)
+        return self.breakers[model_name]
+
+    def _model_for(self, model_name):
+        if model_name == self.model.model_name:
+            return self.model
+        if model_name not in self._models:
+            self._models[model_name] = genai.GenerativeModel(model_name)
+        return self._models[model_name]
+
+    def _fallback_chain(self):
+        """The selected model first, then the other preferred models that are available."""
+        chain = [self.model.model_name]
+        for name in MODEL_PREFERENCES:
+            if name not in chain and (self.available_models is None or name in self.available_models):
+                chain.append(name)
+        return chain
+
+    def _metered_stream(self, model_name, root, start, response, breaker):
+        # Usage metadata, the full latency and success are only known once the stream is consumed
+        last_chunk = None
+        try:
+            for chunk in response:
+                last_chunk = chunk
+                yield chunk
+        except Exception as e:
+            breaker.record_failure()
+            self.metrics.record_call(model_name, root, time.perf_counter() - start, last_chunk, error=e)
+            raise
+        breaker.record_success()
+        self.metrics.record_call(model_name, root, time.perf_counter() - start, last_chunk)
+
+    def _generate(self, prompt, generation_config=None, stream=False, root=None, retry=True):
         """
-        Generates structured data for a given Hebrew root using Gemini.
-        Returns a list of dictionaries.
+        Calls generate_content and returns (name of the model that answered, response);
+        with stream=True the response is the chunk iterator.
+        Each call is recorded in the LLM metrics store; TokenBudgetExceeded is raised instead of
+        calling once today's token budget is spent.
+        Transient errors are retried with jittered backoff, up to GENERATE_ATTEMPTS per model,
+        then the next model of the fallback chain is tried. A model whose circuit breaker is open
+        is skipped. If the selected model no longer exists, the model is re-resolved once.
+        retry=False makes a single call and raises its error, for callers that pace and retry
+        requests themselves (enrich_many's rate limit).
+        generation_config (JSON mode settings) is only sent to models that support it.
+        Every attempt is recorded as a telemetry span.
         """
-        if not self.model:
-            print("Enricher: No model available (Missing API Key).")
-            return None # Explicit None to indicate failure vs empty list
-            
-        # Clean root
+        last_error = None
+        chain = self._fallback_chain()
+        resolved = False
+        while chain:
+            model_name = chain.pop(0)
+            breaker = self._breaker(model_name)
+            config = None if model_name.startswith(NO_JSON_MODE) else generation_config
+            for attempt in range(1, GENERATE_ATTEMPTS + 1):
+                if not breaker.allow():
+                    print(f"Enricher: Circuit open for '{model_name}', skipping it.")
+                    break
+                self.metrics.check_budget()
+                start = time.perf_counter()
+                try:
+                    with span("generate_content", model=model_name, attempt=attempt, stream=stream):
+                        response = self._model_for(model_name).generate_content(
+                            prompt, generation_config=config, stream=stream
+                        )
+                except Exception as e:
+                    self.metrics.record_call(model_name, root, time.perf_counter() - start, error=e)
+                    if not isinstance(e, (google_exceptions.NotFound, *TRANSIENT_ERRORS)):
+                        raise
+                    last_error = e
+                else:
+                    if stream:
+                        return model_name, self._metered_stream(model_name, root, start, response, breaker)
+                    breaker.record_success()
+                    self.metrics.record_call(model_name, root, time.perf_counter() - start, response)
+                    return model_name, response
+
+                if isinstance(last_error, google_exceptions.NotFound):
+                    breaker.trip()
+                    print(f"Enricher: Model '{model_name}' not found ({last_error}).")
+                    if model_name == self.model.model_name and not resolved:
+                        # The (possibly cached) selection is stale: pick again from list_models
+                        resolved = True
+                        self.model_cache.invalidate(self._model_cache_key(self.api_key))
+                        self.model = self._resolve_model(self.api_key, use_cache=False)
+                        if self.model.model_name != model_name:
+                            chain.insert(0, self.model.model_name)
+                    if not retry:
+                        raise last_error
+                    break
+
+                breaker.record_failure()
+                if not retry:
+                    raise last_error
+                if attempt == GENERATE_ATTEMPTS:
+                    print(f"Enricher: '{model_name}' failed {attempt} times ({last_error}), trying the next model.")
+                    break
+                delay = backoff_delay(attempt - 1, base=RETRY_BASE, cap=RETRY_CAP)
+                print(f"Enricher: '{model_name}' attempt {attempt} failed ({last_error}). Retrying in {delay:.1f}s...")
+                time.sleep(delay)
+        raise last_error or RuntimeError("no Gemini model available (all circuits open)")
+
+    def _chunk_text(self, chunk):
+        # The last streamed chunk may carry only the finish reason and no text parts
+        try:
+            return chunk.text
+        except ValueError:
+            return ""
+
+    def _parse_json(self, text):
+        with span("json_cleanup", chars=len(text)):
+            # Strip potential markdown formatting if Gemini adds it (```json ... ```)
+            if text.startswith("```"):
+                text = text.split("\n", 1)[1]
+                if text.endswith("```"):
+                    text = text.rsplit("\n", 1)[0]
+                # Also handle ```json specifically
+                text = text.replace("```json", "").replace("```", "").strip()
+
+            return json.loads(text)
+
+    def _cache_key(self, root, model_name=None):
         clean_root = re.sub(r'[\.\s]', '', root)
-        
+        return ResponseCache.make_key(clean_root, PROMPT_VERSION, model_name or self.model.model_name)
+
+    def _cached_words(self, root):
+        """
+        Cached words for `root` from any model of the fallback chain (the selected one first),
+        since words are cached under the model that answered. Records the hit; None on a miss.
+        """
+        for model_name in self._fallback_chain():
+            cached = self.cache.get(self._cache_key(root, model_name))
+            if cached is not None:
+                self.metrics.record_cache_hit(root, model_name)
+                return cached
+        return None
+
+    def _fetch_words(self, root, on_word=None, retry=True):
+        """
+        Requests the words for one root from Gemini and caches them under the model that answered.
+        The response is streamed as schema-constrained JSON and each word is parsed (and passed
+        to on_word) as soon as it is complete. If the stream breaks off or turns malformed,
+        the words already received are returned (but not cached). Raises if there are none.
+        retry is passed to _generate.
+        """
         prompt = f"""
         You are a Hebrew expert. I have the Hebrew root "{root}" (shoresh).
         Please generate 10 distinct Hebrew words derived from this root.
@@ -83,23 +321,66 @@ class Enricher:
             - "hebrew": A short, natural example sentence in Hebrew using the word.
             - "english": The English translation of the sentence.
             
-        Return the result as a raw JSON list of objects. Do not wrap in markdown or code blocks.
+        Return the result as a JSON list of word objects.
+        """
+        config = genai.GenerationConfig(response_mime_type="application/json", response_schema=WORDS_SCHEMA)
+        stream = JsonArrayStream()
+        words = []
+        model_name = None
+        with bind(root=root), span("stream_words") as record:
+            start = time.perf_counter()
+            try:
+                model_name, chunks = self._generate(prompt, generation_config=config, stream=True, root=root, retry=retry)
+                for chunk in chunks:
+                    for word in stream.feed(self._chunk_text(chunk)):
+                        if not isinstance(word, dict) or not word.get("hebrew"):
+                            continue
+                        if not words:
+                            record["first_word_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                        words.append(word)
+                        if on_word:
+                            on_word(word)
+            except Exception as e:
+                if not words:
+                    raise
+                record["error"] = f"{type(e).__name__}: {e}"
+            record["words"] = len(words)
+            record["complete"] = stream.finished
+
+        if stream.finished:
+            self.cache.set(self._cache_key(root, model_name), words)
+        elif words:
+            print(f"Enricher: Partial response for {root}, keeping {len(words)} complete words.")
+            with open("enrich_log.txt", "a", encoding="utf-8") as f:
+                f.write(f"Gemini Partial Response for {root}: kept {len(words)} words, unparsed: {stream.pending()[:200]!r}\n")
+        else:
+            raise ValueError(f"no complete word in response: {stream.pending()[:200]!r}")
+        return words
+
+    def get_words_for_root(self, root, refresh=False, on_word=None):
+        """
+        Generates structured data for a given Hebrew root using Gemini.
+        Returns a list of dictionaries.
+        Responses are cached on disk; refresh=True skips the cache and regenerates.
+        on_word(word) is called for each freshly generated word as soon as it has streamed in.
+        Errors are returned as a "GenError: ..." string, except TokenBudgetExceeded, which is
+        raised so the caller can stop without treating it as a failure.
         """
+        if not self.model:
+            print("Enricher: No model available (Missing API Key).")
+            return None # Explicit None to indicate failure vs empty list
+            
+        if not refresh:
+            cached = self._cached_words(root)
+            if cached is not None:
+                print(f"Enricher: Using cached response for {root}")
+                return cached
         
         try:
-            response = self.model.generate_content(prompt)
-            # Strip potential markdown formatting if Gemini adds it (```json ... ```)
-            text = response.text
-            if text.startswith("```"):
-                text = text.split("\n", 1)[1]
-                if text.endswith("```"):
-                    text = text.rsplit("\n", 1)[0]
-                # Also handle ```json specifically
-                text = text.replace("```json", "").replace("```", "").strip()
-            
-            data = json.loads(text)
-            return data
-            
+            return self._fetch_words(root, on_word=on_word)
+
+        except TokenBudgetExceeded:
+            raise
         except Exception as e:
             error_msg = f"GenError: {str(e)}"
             print(error_msg)
@@ -108,6 +389,198 @@ class Enricher:
                 f.write(f"Gemini Request Failed for {root}: {e}\n")
             return error_msg
 
+    def get_words_for_roots(self, roots, refresh=False):
+        """
+        Generates words for several roots, packing up to BATCH_SIZE roots per request.
+        Returns a dict keyed by root with the same values get_words_for_root would return.
+        A truncated or malformed batch response is split in half and retried; API errors
+        (auth, permission, invalid argument, exhausted retries) fail the whole batch instead.
+        """
+        if not self.model:
+            print("Enricher: No model available (Missing API Key).")
+            return {root: None for root in roots}
+
+        results = {}
+        pending = []
+        for root in roots:
+            cached = None if refresh else self._cached_words(root)
+            if cached is not None:
+                results[root] = cached
+            elif root not in pending:
+                pending.append(root)
+
+        if pending:
+            print(f"Enricher: {len(results)} roots cached, generating {len(pending)}...")
+        for i in range(0, len(pending), BATCH_SIZE):
+            batch = pending[i:i + BATCH_SIZE]
+            try:
+                self.metrics.check_budget()
+                results.update(self._generate_batch(batch))
+            except TokenBudgetExceeded as e:
+                # Stop cleanly: the remaining roots are left for another day
+                print(f"Enricher: {e}. Stopping with {len(pending) - i} roots not generated.")
+                results.update({root: f"BudgetExceeded: {e}" for root in pending[i:] if root not in results})
+                break
+            except Exception as e:
+                error_msg = f"GenError: {str(e)}"
+                print(error_msg)
+                with open("enrich_log.txt", "a", encoding="utf-8") as f:
+                    f.write(f"Gemini Batch Request Failed for {', '.join(batch)}: {e}\n")
+                results.update({root: error_msg for root in batch if root not in results})
+        return results
+
+    def _generate_batch(self, roots):
+        if len(roots) == 1:
+            try:
+                return {roots[0]: self._fetch_words(roots[0])}
+            except ValueError as e:
+                # Nothing usable and nothing left to split
+                print(f"GenError: {e}")
+                with open("enrich_log.txt", "a", encoding="utf-8") as f:
+                    f.write(f"Gemini Request Failed for {roots[0]}: {e}\n")
+                return {roots[0]: f"GenError: {str(e)}"}
+
+        root_list = "\n".join(f'- "{root}"' for root in roots)
+        prompt = f"""
+        You are a Hebrew expert. I have the following Hebrew roots (shorashim):
+        {root_list}
+        For each root, generate 10 distinct Hebrew words derived from it.
+        
+        For each word, provide:
+        1. "hebrew": The word in Hebrew with Nikud (vocalized).
+        2. "transliteration": Standard English transliteration.
+        3. "type": Part of speech (e.g., Noun, Verb - Pa'al, Adjective).
+        4. "translation": A clear English definition/translation.
+        5. "example": A dictionary object containing:
+            - "hebrew": A short, natural example sentence in Hebrew using the word.
+            - "english": The English translation of the sentence.
+            
+        Return the result as a raw JSON object mapping each root, written exactly as given above,
+        to its list of word objects. Do not wrap in markdown or code blocks.
+        """
+
+        try:
+            with bind(root=",".join(roots)):
+                # JSON mode (no schema: the object is keyed by the roots themselves)
+                model_name, response = self._generate(
+                    prompt, generation_config=genai.GenerationConfig(response_mime_type="application/json"), root=",".join(roots)
+                )
+            candidates = getattr(response, "candidates", None) or []
+            if candidates and "MAX_TOKENS" in str(getattr(candidates[0], "finish_reason", "")):
+                raise ValueError("response truncated (MAX_TOKENS)")
+
+            data = self._parse_json(response.text)
+            if not isinstance(data, dict):
+                raise ValueError("expected a JSON object keyed by root")
+
+            # Match returned keys loosely (the model may drop dots or spaces)
+            by_clean = {re.sub(r'[\.\s]', '', key): value for key, value in data.items()}
+            results = {}
+            for root in roots:
+                words = by_clean.get(re.sub(r'[\.\s]', '', root))
+                if not isinstance(words, list):
+                    raise ValueError(f"missing words for root {root}")
+                results[root] = words
+
+            for root, words in results.items():
+                self.cache.set(self._cache_key(root, model_name), words)
+            return results
+
+        except ValueError as e:
+            # Truncated, invalid JSON (JSONDecodeError) or roots missing: smaller batches may fit.
+            # API errors propagate, retrying them on halves would only repeat the same failure.
+            print(f"Enricher: Batch of {len(roots)} roots failed ({e}). Splitting...")
+            with open("enrich_log.txt", "a", encoding="utf-8") as f:
+                f.write(f"Gemini Batch Request Failed for {', '.join(roots)}: {e}\n")
+            middle = len(roots) // 2
+            results = {}
+            # Each half fails on its own, so one half's error does not discard the other's words
+            for half in (roots[:middle], roots[middle:]):
+                try:
+                    results.update(self._generate_batch(half))
+                except TokenBudgetExceeded as budget_error:
+                    results.update({root: f"BudgetExceeded: {budget_error}" for root in half})
+                except Exception as half_error:
+                    print(f"GenError: {half_error}")
+                    with open("enrich_log.txt", "a", encoding="utf-8") as f:
+                        f.write(f"Gemini Batch Request Failed for {', '.join(half)}: {half_error}\n")
+                    results.update({root: f"GenError: {str(half_error)}" for root in half})
+            return results
+
+    def enrich_many(self, roots, concurrency=4, rpm=15, max_retries=5, on_result=None, refresh=False):
+        """
+        Generates words for many roots concurrently.
+        At most `concurrency` requests are in flight and at most `rpm` are started per minute.
+        429s and other transient errors are retried here with jittered exponential backoff, each
+        attempt taking a rate-limit token (once a model's circuit opens, the next one is used).
+        Results are cached (and passed to on_result(root, words)) as soon as each one completes.
+        Once DAILY_TOKEN_BUDGET is spent the remaining roots are skipped ("BudgetExceeded: ...").
+        Returns a dict keyed by root; failed roots map to an error string.
+        """
+        if not self.model:
+            print("Enricher: No model available (Missing API Key).")
+            return {root: None for root in roots}
+
+        bucket = TokenBucket(rpm, per=60.0, capacity=min(rpm, concurrency))
+        # Set once the daily token budget is spent: queued roots then finish without calling Gemini
+        budget_spent = threading.Event()
+
+        def task(root):
+            if not refresh:
+                cached = self._cached_words(root)
+                if cached is not None:
+                    return cached
+            if budget_spent.is_set():
+                raise TokenBudgetExceeded("daily token budget spent")
+            for attempt in range(max_retries + 1):
+                bucket.acquire()
+                try:
+                    # One call per bucket token: the retries and backoff are done here, not in _generate
+                    return self._fetch_words(root, retry=False)
+                except TRANSIENT_ERRORS as e:
+                    if attempt == max_retries:
+                        raise
+                    if isinstance(e, google_exceptions.ResourceExhausted):
+                        # Quota hit: stop everyone from starting new requests, then back off
+                        bucket.drain()
+                    delay = backoff_delay(attempt, base=2.0)
+                    print(f"Enricher: Request for {root} failed ({e}). Retrying in {delay:.1f}s...")
+                    time.sleep(delay)
+
+        results = {}
+        unique_roots = list(dict.fromkeys(roots))
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {executor.submit(task, root): root for root in unique_roots}
+            for future in as_completed(futures):
+                root = futures[future]
+                try:
+                    words = future.result()
+                except TokenBudgetExceeded as e:
+                    if not budget_spent.is_set():
+                        print(f"Enricher: {e}. Stopping, remaining roots are left for another run.")
+                        budget_spent.set()
+                    words = f"BudgetExceeded: {e}"
+                except Exception as e:
+                    words = f"GenError: {str(e)}"
+                    with open("enrich_log.txt", "a", encoding="utf-8") as f:
+                        f.write(f"Gemini Request Failed for {root}: {e}\n")
+                results[root] = words
+                print(f"Enricher: {len(results)}/{len(unique_roots)} done ({root})")
+                if on_result:
+                    on_result(root, words)
+        return results
+
+    def lookup_word(self, word):
+        """
+        Looks `word` up in every dictionary source concurrently (Pealim, Milog, Reverso, Tatoeba).
+        Returns {source name: results}; a source that failed maps to an error string.
+        """
+        # The scraping stack (requests, bs4, lxml) is only loaded by this lookup
+        from sources import lookup_all, make_sources
+        if self.sources is None:
+            self.sources = make_sources()
+        return lookup_all(word, self.sources)
+
 if __name__ == "__main__":
     # Test run (requires env var set via CLI on run)
     enricher = Enricher()
@@ -0,0 +1,85 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+def _make_parser(pdf_path, legacy, layout=False):
+    if layout:
+        from pdf_parser_legacy import PDFParser
+        return PDFParser(pdf_path, layout=True)
+    if legacy:
+        from pdf_parser_legacy import PDFParser
+    else:
+        from pdf_parser import PDFParser
+    return PDFParser(pdf_path)
+
+def _extract_range(pdf_path, start_page, end_page, legacy, layout=False):
+    # Runs in a worker process: each worker opens the PDF on its own
+    parser = _make_parser(pdf_path, legacy, layout)
+    return list(parser.iter_roots(start_page, end_page))
+
+def extract_document(pdf_path, workers=1, legacy=False, chunk_size=None, layout=False):
+    """
+    Extracts (page_num, root, words) for every page of the PDF.
+    With workers > 1 the page range is split into chunks handled by a process pool;
+    results are merged back in page order.
+    layout=True uses the legacy parser's char-box layout mode for the entries.
+    """
+    parser = _make_parser(pdf_path, legacy, layout)
+    if workers <= 1:
+        return list(parser.iter_roots(0))
+
+    page_count = parser.page_count()
+    if not chunk_size:
+        # A few chunks per worker keeps the pool busy when some pages are slower
+        chunk_size = max(1, -(-page_count // (workers * 4)))
+
+    starts = list(range(0, page_count, chunk_size))
+    ends = [min(start + chunk_size, page_count) for start in starts]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() yields chunk results in submission order, i.e. page order
+        chunks = executor.map(
+            _extract_range, [pdf_path] * len(starts), starts, ends, [legacy] * len(starts), [layout] * len(starts)
+        )
+        for chunk in chunks:
+            results.extend(chunk)
+    return results
+
+def compare(pdf_path, workers, legacy=False, layout=False):
+    """Times the serial and parallel paths on the same PDF and prints a report."""
+    start = time.perf_counter()
+    serial = extract_document(pdf_path, workers=1, legacy=legacy, layout=layout)
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = extract_document(pdf_path, workers=workers, legacy=legacy, layout=layout)
+    parallel_time = time.perf_counter() - start
+
+    print(f"Parser: {'layout' if layout else 'legacy' if legacy else 'current'}")
+    print(f"Serial:   {len(serial)} roots in {serial_time:.2f}s")
+    print(f"Parallel: {len(parallel)} roots in {parallel_time:.2f}s ({workers} workers)")
+    if parallel_time > 0:
+        print(f"Speedup:  {serial_time / parallel_time:.2f}x")
+    print(f"Results match: {serial == parallel}")
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+
+    arg_parser = argparse.ArgumentParser(description="Extract the roots of every page in the PDF.")
+    arg_parser.add_argument("pdf", nargs="?", default="roots.pdf")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    arg_parser.add_argument("--legacy", action="store_true", help="Use the legacy parser (roots and entries)")
+    arg_parser.add_argument("--layout", action="store_true", help="Use the legacy parser's char-box layout mode")
+    arg_parser.add_argument("--compare", action="store_true", help="Report serial vs parallel timings")
+    args = arg_parser.parse_args()
+
+    if args.compare:
+        compare(args.pdf, args.workers, args.legacy, args.layout)
+    else:
+        start = time.perf_counter()
+        for page_num, root, words in extract_document(args.pdf, args.workers, args.legacy, layout=args.layout):
+            print(f"Page {page_num + 1}: {root} ({len(words)} entries)")
+        print(f"Done in {time.perf_counter() - start:.2f}s")
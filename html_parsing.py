@@ -0,0 +1,23 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml's C parser is several times faster than the pure-Python html.parser; use it when installed
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+# Only the subtrees the scrapers read; everything else on the page is never built
+PEALIM_RESULTS = SoupStrainer('div', class_='verb-search-result')
+PEALIM_HEADINGS = SoupStrainer(['h2', 'h3', 'h4'])
+MILOG_DEFINITIONS = SoupStrainer('div', class_='sr_e_txt')
+REVERSO_EXAMPLES = SoupStrainer('div', class_='example')
+TATOEBA_SENTENCES = SoupStrainer('div', class_='sentence-and-translations')
+
+def make_soup(html, strainer=None, parser=None):
+    """Parses html with the fastest available backend, keeping only what `strainer` matches."""
+    return BeautifulSoup(html, parser or PARSER, parse_only=strainer)
+
+def pealim_headings(html):
+    """Heading texts of a Pealim dictionary page ('Conjugation of ...', 'Meaning', ...)."""
+    return [h.get_text(strip=True) for h in make_soup(html, PEALIM_HEADINGS).find_all(['h2', 'h3', 'h4'])]
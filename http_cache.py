@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from urllib.parse import quote
+
+from response_cache import atomic_write_json
+
+CACHE_DIR = "http_cache"
+# Entries younger than this are served without touching the network (seconds)
+MAX_AGE = 24 * 3600
+
+# Saved pages recorded as cache entries, so lookups of these URLs run without network access
+FIXTURES = {
+    "pealim.html": "https://www.pealim.com/search/?q=" + quote("הפכ"),
+    "pealim_detail.html": "https://www.pealim.com/dict/468-lahafoch/",
+    "tatoeba_debug.html": f"https://tatoeba.org/en/sentences/search?query={quote('להחל')}&from=heb&to=eng",
+}
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a URL is not in the cache."""
+
+class HttpCache:
+    """
+    Disk cache of GET responses keyed by URL, one JSON file per URL.
+    Entries store the body with its ETag/Last-Modified so stale entries can be revalidated
+    with a conditional request; offline mode serves entries of any age and never fetches.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, max_age=MAX_AGE, offline=None):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        if offline is None:
+            offline = os.environ.get("HTTP_OFFLINE", "").lower() in ("1", "true", "yes")
+        self.offline = offline
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url):
+        """Returns the stored entry for url, or None."""
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        # Guard against a (very unlikely) hash collision
+        return entry if entry.get("url") == url else None
+
+    def is_fresh(self, entry):
+        return time.time() - entry["fetched"] < self.max_age
+
+    def conditional_headers(self, entry):
+        """Validators for revalidating a stale entry (If-None-Match / If-Modified-Since)."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, body, headers=None):
+        headers = headers or {}
+        entry = {
+            "url": url,
+            "body": body,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched": time.time()
+        }
+        atomic_write_json(self._path(url), entry)
+        return entry
+
+    def touch(self, url, entry):
+        """A 304 confirmed the entry is still current: restart its freshness window."""
+        entry["fetched"] = time.time()
+        atomic_write_json(self._path(url), entry)
+
+    def seed(self, url, file_path):
+        """Records a saved HTML file as the cached response for url."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            return self.store(url, f.read())
+
+def seed_fixtures(cache, fixtures=FIXTURES):
+    """Seeds the cache with the checked-in HTML pages that exist on disk."""
+    seeded = []
+    for file_path, url in fixtures.items():
+        if os.path.exists(file_path):
+            cache.seed(url, file_path)
+            seeded.append(url)
+    return seeded
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    for url in seed_fixtures(HttpCache()):
+        print(f"Seeded {url}")
@@ -0,0 +1,53 @@
+import json
+
+class JsonArrayStream:
+    """
+    Incremental parser for a streamed top-level JSON array of objects.
+    feed() takes text as it arrives and returns the elements completed by it, so callers can
+    use each object as soon as its closing brace is received. Anything before the opening
+    "[" (e.g. a stray ```json fence) is ignored.
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.started = False
+        self.finished = False
+        self.items = []
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, text):
+        self.buffer += text
+        completed = []
+        if not self.started:
+            start = self.buffer.find("[", self.pos)
+            if start == -1:
+                return completed
+            self.pos = start + 1
+            self.started = True
+
+        while not self.finished:
+            # Skip separators between elements
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n,":
+                self.pos += 1
+            if self.pos >= len(self.buffer):
+                break
+            if self.buffer[self.pos] == "]":
+                self.pos += 1
+                self.finished = True
+                break
+            # Elements are objects: no point decoding before their closing brace has arrived
+            if "}" not in self.buffer[self.pos:]:
+                break
+            try:
+                item, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete element (or one containing "}" in a string): wait for more text
+                break
+            self.pos = end
+            completed.append(item)
+        self.items.extend(completed)
+        return completed
+
+    def pending(self):
+        """Text received after the last complete element that has not been parsed."""
+        return self.buffer[self.pos:].strip()
@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+# One JSON object per Gemini call or cache lookup
+METRICS_FILE = "llm_metrics.jsonl"
+
+class TokenBudgetExceeded(Exception):
+    """Raised before a Gemini call once today's DAILY_TOKEN_BUDGET is spent."""
+
+def _today():
+    return time.strftime("%Y-%m-%d")
+
+def _usage(response):
+    """(prompt, response, total) token counts from a response's usage_metadata (zeros if absent)."""
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return 0, 0, 0
+    prompt = getattr(usage, "prompt_token_count", 0) or 0
+    candidates = getattr(usage, "candidates_token_count", 0) or 0
+    total = getattr(usage, "total_token_count", 0) or prompt + candidates
+    return prompt, candidates, total
+
+class LLMMetrics:
+    """
+    Append-only store of Gemini usage: model, token counts, latency and cache hits/misses.
+    Also enforces an optional daily token budget (budget=None means unlimited).
+    """
+    def __init__(self, file_path=METRICS_FILE, budget=None):
+        self.file_path = file_path
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._day = _today()
+        self.tokens_today = sum(r.get("total_tokens", 0) for r in self.load() if r.get("date") == self._day)
+
+    def load(self):
+        if not os.path.exists(self.file_path):
+            return []
+        records = []
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A run killed mid-write leaves a partial last line
+                    continue
+        return records
+
+    def _append(self, record):
+        with self._lock:
+            if record["date"] != self._day:
+                self._day = record["date"]
+                self.tokens_today = 0
+            self.tokens_today += record.get("total_tokens", 0)
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def record_call(self, model, root, latency, response=None, error=None):
+        """Records one generate_content call; latency in seconds."""
+        prompt_tokens, response_tokens, total_tokens = _usage(response)
+        record = {
+            "ts": round(time.time(), 3),
+            "date": _today(),
+            "event": "generate",
+            "model": model,
+            "root": root,
+            "latency_ms": round(latency * 1000, 1),
+            "prompt_tokens": prompt_tokens,
+            "response_tokens": response_tokens,
+            "total_tokens": total_tokens,
+            "cache": "miss",
+        }
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        self._append(record)
+
+    def record_cache_hit(self, root, model=None):
+        self._append({"ts": round(time.time(), 3), "date": _today(), "event": "cache", "model": model, "root": root, "cache": "hit"})
+
+    def check_budget(self):
+        with self._lock:
+            if self._day != _today():
+                self._day = _today()
+                self.tokens_today = 0
+            if self.budget is not None and self.tokens_today >= self.budget:
+                raise TokenBudgetExceeded(f"daily token budget spent ({self.tokens_today}/{self.budget})")
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+def summarize(records):
+    """Per-day totals: calls, errors, cache hits, p50/p95 latency, tokens and tokens per root."""
+    days = {}
+    for r in records:
+        day = days.setdefault(r["date"], {"calls": 0, "errors": 0, "hits": 0, "latencies": [], "tokens": 0, "roots": set()})
+        if r["event"] == "cache":
+            day["hits"] += 1
+            continue
+        day["calls"] += 1
+        day["tokens"] += r.get("total_tokens", 0)
+        day["latencies"].append(r["latency_ms"])
+        if "error" in r:
+            day["errors"] += 1
+        elif r.get("root"):
+            day["roots"].add(r["root"])
+
+    summary = {}
+    for date, day in sorted(days.items()):
+        lookups = day["calls"] + day["hits"]
+        summary[date] = {
+            "calls": day["calls"],
+            "errors": day["errors"],
+            "cache_hit_rate": day["hits"] / lookups if lookups else 0.0,
+            "p50_ms": _percentile(day["latencies"], 50),
+            "p95_ms": _percentile(day["latencies"], 95),
+            "tokens": day["tokens"],
+            "roots": len(day["roots"]),
+            "tokens_per_root": day["tokens"] / len(day["roots"]) if day["roots"] else 0.0,
+        }
+    return summary
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    arg_parser = argparse.ArgumentParser(description="Summarize Gemini latency and token usage per day.")
+    arg_parser.add_argument("--days", type=int, default=14, help="Number of most recent days to show")
+    arg_parser.add_argument("--file", default=METRICS_FILE)
+    args = arg_parser.parse_args()
+
+    summary = summarize(LLMMetrics(args.file).load())
+    print(f"{'Date':<12}{'calls':>7}{'errors':>8}{'hit %':>7}{'p50 ms':>9}{'p95 ms':>9}{'tokens':>10}{'roots':>7}{'tok/root':>10}")
+    for date, day in list(summary.items())[-args.days:]:
+        print(f"{date:<12}{day['calls']:>7}{day['errors']:>8}{day['cache_hit_rate'] * 100:>7.0f}{day['p50_ms']:>9.0f}"
+              f"{day['p95_ms']:>9.0f}{day['tokens']:>10}{day['roots']:>7}{day['tokens_per_root']:>10.0f}")
+    budget = os.environ.get("DAILY_TOKEN_BUDGET")
+    if budget:
+        used = summary.get(_today(), {}).get("tokens", 0)
+        print(f"Today's budget: {used}/{budget} tokens")
@@ -1,10 +1,13 @@
 import os
 import sys
-import requests
 import argparse
-from pdf_parser import PDFParser
-from enricher import Enricher
-from state_manager import StateManager
+from state_manager import open_state_manager, migrate_history
+from root_index import RootIndex
+from schedule import Schedule
+from outbox import Outbox
+from telemetry import bind, span
+# pdf_parser (pdfplumber), enricher (google.generativeai) and telegram_delivery (requests)
+# are imported by the stage that needs them: most runs never touch some of them
 
 # Fix encoding
 sys.stdout.reconfigure(encoding='utf-8')
@@ -13,25 +16,35 @@ sys.stdout.reconfigure(encoding='utf-8')
 PDF_PATH = "roots.pdf"
 TELEGRAM_TOKEN = os.environ.get("TELEGRAM_TOKEN", "YOUR_TOKEN_HERE")
 CHAT_ID = os.environ.get("CHAT_ID", "YOUR_CHAT_ID")
+# CHAT_ID may list several chats separated by commas
+CHAT_IDS = [c.strip() for c in CHAT_ID.split(",") if c.strip()]
+PROFILE_FILE = "profile.pstats"
 
 def send_telegram_message(message):
+    """Sends the message to every chat in CHAT_ID (comma-separated). Returns {chat_id: result}."""
     if TELEGRAM_TOKEN == "YOUR_TOKEN_HERE":
         print("Telegram Token not set. Printing message instead:")
         print(message)
-        return
+        return {}
+
+    from telegram_delivery import TelegramDelivery
+    delivery = TelegramDelivery(TELEGRAM_TOKEN)
+    results = delivery.broadcast(CHAT_IDS, message)
+    for chat_id, result in results.items():
+        if not result["ok"]:
+            print(f"Failed to send Telegram message to {chat_id}: {result['error']}")
+    sent = sum(1 for r in results.values() if r["ok"])
+    print(f"Message sent successfully to {sent}/{len(results)} chats.")
+    return results
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": CHAT_ID,
-        "text": message,
-        "parse_mode": "Markdown"
-    }
-    try:
-        response = requests.post(url, json=payload)
-        response.raise_for_status()
-        print("Message sent successfully.")
-    except Exception as e:
-        print(f"Failed to send Telegram message: {e}")
+def flush_outbox(outbox):
+    """Retries every due message in the outbox. No PDF or Gemini work is involved."""
+    if TELEGRAM_TOKEN == "YOUR_TOKEN_HERE":
+        print("Telegram Token not set. Leaving outbox untouched.")
+        return
+    from telegram_delivery import TelegramDelivery
+    sent, failed, remaining = outbox.flush(TelegramDelivery(TELEGRAM_TOKEN))
+    print(f"Outbox: {sent} sent, {failed} given up, {remaining} pending.")
 
 def format_message(root_text, words):
     """
@@ -78,42 +91,149 @@ def format_message(root_text, words):
             
     return "\n".join(lines)
 
+def pregenerate(args, schedule, root_index, state_manager, next_page):
+    """Warms the Gemini response cache for the next upcoming roots."""
+    if schedule.is_current(PDF_PATH):
+        pages = ((entry["page"], entry["root"]) for entry in schedule.entries if entry["page"] >= next_page)
+    elif root_index.is_valid():
+        pages = ((page_num, root_index.get(page_num)["root"]) for page_num in sorted(root_index.pages) if page_num >= next_page)
+    else:
+        from pdf_parser import PDFParser
+        pages = ((page_num, root) for page_num, root, _ in PDFParser(PDF_PATH).iter_roots(next_page))
+
+    roots = []
+    for page_num, root in pages:
+        if not state_manager.is_root_used(root) and root not in roots:
+            roots.append(root)
+        if len(roots) >= args.pregenerate:
+            break
+
+    print(f"Pre-generating content for {len(roots)} roots...")
+    with span("enricher_init"):
+        from enricher import Enricher
+        enricher = Enricher()
+    results = enricher.enrich_many(roots, concurrency=args.concurrency, rpm=args.rpm, refresh=args.refresh)
+    failed = [root for root, words in results.items() if not isinstance(words, list)]
+    skipped = [root for root in failed if str(results[root]).startswith("BudgetExceeded")]
+    print(f"Pre-generated {len(results) - len(failed)} roots ({len(failed) - len(skipped)} failed, "
+          f"{len(skipped)} left for later by the daily token budget).")
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--preview", action="store_true", help="Preview only, don't update state")
+    parser.add_argument("--build-index", action="store_true", help="(Re)build the root index of the PDF before running")
+    parser.add_argument("--build-schedule", action="store_true", help="Plan every lesson of the PDF into schedule.json, then exit")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for --build-index / --build-schedule")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached Gemini responses and regenerate")
+    parser.add_argument("--pregenerate", type=int, metavar="N", help="Generate and cache content for the next N roots, then exit")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent Gemini requests for --pregenerate")
+    parser.add_argument("--rpm", type=int, default=15, help="Gemini requests per minute quota for --pregenerate")
+    parser.add_argument("--state-backend", choices=["json", "sqlite"], help="State storage (default: STATE_BACKEND env var or json)")
+    parser.add_argument("--migrate-state", action="store_true", help="Import history.json into the SQLite state database, then exit")
+    parser.add_argument("--flush-outbox", action="store_true", help="Retry undelivered messages from the outbox, then exit")
+    parser.add_argument("--profile", action="store_true", help=f"Profile the whole run with cProfile (stats saved to {PROFILE_FILE})")
     args = parser.parse_args()
 
+    if args.profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(run, args)
+        finally:
+            profiler.dump_stats(PROFILE_FILE)
+            print(f"Profile saved to {PROFILE_FILE}. Top functions by cumulative time:")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+    else:
+        run(args)
+
+def run(args):
+    """One bot run for the parsed command line arguments."""
+    if args.flush_outbox:
+        flush_outbox(Outbox())
+        return
+
+    if args.migrate_state:
+        migrate_history()
+        return
+
     # Initialize
-    pdf_parser = PDFParser(PDF_PATH)
-    enricher = Enricher()
-    state_manager = StateManager()
+    state_manager = open_state_manager(args.state_backend)
+
+    root_index = RootIndex(PDF_PATH)
+    if args.build_index:
+        root_index.build(workers=args.workers)
+
+    schedule = Schedule()
+    if args.build_schedule:
+        schedule.build(PDF_PATH, workers=args.workers, root_index=root_index)
+        return
 
     # Find next page
     last_page = state_manager.get_last_page()
     next_page = last_page + 1
+
+    if args.pregenerate:
+        pregenerate(args, schedule, root_index, state_manager, next_page)
+        return
     
+    # Messages left from earlier runs go out first, also on days without a new lesson
+    outbox = Outbox()
+    if outbox.due() and not args.preview:
+        flush_outbox(outbox)
+
     # Try finding a valid root on next pages
-    max_pages = 262 # From analysis
-    found_data = None
+    with span("find_root", start_page=next_page) as record:
+        current_page, found_data = find_next_root(schedule, root_index, state_manager, next_page)
+        record["page"] = current_page
+        record["root"] = found_data["root"] if found_data else None
     
-    # Heuristic: limit search to next 10 pages to avoid infinite loop if EOF
-    for page_num in range(next_page, min(next_page + 10, max_pages)):
-        print(f"Checking page {page_num + 1}...")
-        data = pdf_parser.parse_page(page_num)
-        
-        if data and data['root']:
+    if not found_data:
+        print(f"No new roots found after page {next_page}: every root of the PDF has been sent.")
+        return
+
+    with bind(page=current_page, root=found_data["root"]):
+        publish(args, state_manager, current_page, found_data)
+
+def find_next_root(schedule, root_index, state_manager, next_page):
+    """Returns (page_num, {"root", "words"}) for the first unused root from next_page, or (None, None)."""
+    current_page, found_data = None, None
+    if schedule.is_current(PDF_PATH):
+        # Fastest path: the next lesson is already planned
+        entry = schedule.next_entry(next_page, state_manager.is_root_used)
+        if entry:
+            print(f"Schedule: day {entry['day']} of {len(schedule.entries)}, page {entry['page'] + 1}.")
+            current_page, found_data = entry["page"], {"root": entry["root"], "words": []}
+    elif root_index.is_valid():
+        # Fast path: the index already knows every page's root
+        current_page, found_data = root_index.next_root(next_page, state_manager.is_root_used)
+        if found_data:
+            print(f"Root index: next root is on page {current_page + 1}.")
+    else:
+        from pdf_parser import PDFParser
+        pdf_parser = PDFParser(PDF_PATH)
+        print("No schedule or root index, scanning PDF pages (run with --build-schedule to speed this up).")
+        # Scans up to the end of the PDF; iter_roots keeps it open across pages instead of re-opening it for each one
+        for page_num, root, words in pdf_parser.iter_roots(next_page):
+            print(f"Checking page {page_num + 1}...")
+            
             # Check if root used (duplicate check)
-            if state_manager.is_root_used(data['root']):
-                print(f"Root {data['root']} already used. Skipping.")
+            if state_manager.is_root_used(root):
+                print(f"Root {root} already used. Skipping.")
                 continue
             
-            found_data = data
+            found_data = {"root": root, "words": words}
             current_page = page_num
             break
-    
-    if not found_data:
-        print("No new roots found.")
-        return
+    return current_page, found_data
+
+def publish(args, state_manager, current_page, found_data):
+    """Generates, formats and delivers the lesson for the found root, then records it as used."""
+    # Only now is there work for Gemini: import and resolve the model
+    with span("enricher_init"):
+        from enricher import Enricher
+        from llm_metrics import TokenBudgetExceeded
+        enricher = Enricher()
 
     root = found_data['root']
     words = found_data['words']
@@ -122,7 +242,13 @@ def main():
     
     # Gemini Enrichment
     print("Generating content with Gemini...")
-    words = enricher.get_words_for_root(root)
+    with span("enrich"):
+        try:
+            words = enricher.get_words_for_root(root, refresh=args.refresh)
+        except TokenBudgetExceeded as e:
+            # Not a failure to report to the chats: no message, and the root stays unused for the next run
+            print(f"Skipping today's lesson for {root}: {e}.")
+            return
     
     if words is None:
         error_msg = ("⚠️ **Configuration Error** ⚠️\n\n"
@@ -143,7 +269,8 @@ def main():
         print("Warning: Gemini returned no words (Empty List). Sending fallback message.")
     
     # Format Message
-    msg = format_message(root, words)
+    with span("format_message"):
+        msg = format_message(root, words)
     
     # Write message to file for verification
     with open("message_preview.md", "w", encoding="utf-8") as f:
@@ -153,11 +280,20 @@ def main():
     print(f"Generated message for root {root}. See message_preview.md")
     
     # Send
-    send_telegram_message(msg)
+    with span("deliver", chats=len(CHAT_IDS)):
+        if args.preview or TELEGRAM_TOKEN == "YOUR_TOKEN_HERE":
+            send_telegram_message(msg)
+        else:
+            # Store the rendered message first so a failed send can be retried with --flush-outbox
+            outbox = Outbox()
+            outbox.enqueue(CHAT_IDS, msg, root=root, page=current_page)
+            flush_outbox(outbox)
     
     # Update State
+    # (the lesson is durable in the outbox now, so the root counts as used even if delivery failed)
     if not args.preview:
-        state_manager.mark_used(root, current_page)
+        with span("state_update"):
+            state_manager.mark_used(root, current_page)
         print("State updated.")
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+import json
+import os
+import time
+import uuid
+
+from response_cache import atomic_write_json
+from telemetry import bind
+
+OUTBOX_FILE = "outbox.json"
+# Give up on a message after this many failed deliveries
+MAX_ATTEMPTS = 8
+# Retry delay doubles after every failure: 1 min, 2 min, 4 min... capped at 6 hours
+RETRY_BASE = 60
+RETRY_CAP = 6 * 3600
+# Delivered messages are kept this long for reference, then pruned
+KEEP_SENT = 7 * 24 * 3600
+
+class Outbox:
+    """
+    Durable per-chat queue of rendered messages.
+    Messages are stored before sending and keep their delivery status, so a failed
+    send can be retried later without re-running the PDF scan or Gemini.
+    """
+    def __init__(self, file_path=OUTBOX_FILE):
+        self.file_path = file_path
+        self.entries = self._load_entries()
+
+    def _load_entries(self):
+        if not os.path.exists(self.file_path):
+            return []
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return []
+
+    def save(self):
+        now = time.time()
+        self.entries = [
+            e for e in self.entries
+            if not (e["status"] == "sent" and now - e["sent_at"] > KEEP_SENT)
+        ]
+        atomic_write_json(self.file_path, self.entries, indent=2)
+
+    def enqueue(self, chat_ids, text, root=None, page=None):
+        """Stores one pending message per chat and returns their ids."""
+        now = time.time()
+        ids = []
+        for chat_id in chat_ids:
+            entry_id = uuid.uuid4().hex
+            self.entries.append({
+                "id": entry_id,
+                "chat_id": chat_id,
+                "text": text,
+                "root": root,
+                "page": page,
+                "status": "pending",
+                "attempts": 0,
+                "last_error": None,
+                "created_at": now,
+                "next_attempt_at": now,
+                "sent_at": None
+            })
+            ids.append(entry_id)
+        self.save()
+        return ids
+
+    def due(self, now=None):
+        now = now or time.time()
+        return [e for e in self.entries if e["status"] == "pending" and e["next_attempt_at"] <= now]
+
+    def flush(self, delivery):
+        """
+        Sends every due message through `delivery` (a TelegramDelivery) and records the outcome.
+        Returns (sent, failed, remaining) counts.
+        """
+        due = self.due()
+        # Messages with the same text (one lesson, many chats) go out as one broadcast
+        by_text = {}
+        for entry in due:
+            by_text.setdefault(entry["text"], []).append(entry)
+
+        sent = failed = 0
+        for text, entries in by_text.items():
+            # Same text, same lesson: tag the sends with its page and root (also on later retries)
+            with bind(page=entries[0]["page"], root=entries[0]["root"]):
+                results = delivery.broadcast([e["chat_id"] for e in entries], text)
+            now = time.time()
+            for entry in entries:
+                result = results[entry["chat_id"]]
+                entry["attempts"] += 1
+                if result["ok"]:
+                    entry["status"] = "sent"
+                    entry["sent_at"] = now
+                    entry["last_error"] = None
+                    sent += 1
+                    continue
+
+                entry["last_error"] = result["error"]
+                # A permanent error (chat not found, bot blocked, bad markup) is not retried
+                if entry["attempts"] >= MAX_ATTEMPTS or not result.get("retryable", True):
+                    entry["status"] = "failed"
+                    failed += 1
+                else:
+                    delay = min(RETRY_CAP, RETRY_BASE * 2 ** (entry["attempts"] - 1))
+                    entry["next_attempt_at"] = now + delay
+            self.save()
+
+        remaining = sum(1 for e in self.entries if e["status"] == "pending")
+        return sent, failed, remaining
@@ -1,5 +1,6 @@
 import pdfplumber
 import re
+from telemetry import span
 
 class PDFParser:
     def __init__(self, pdf_path):
@@ -12,6 +13,31 @@ class PDFParser:
     def _is_hebrew(self, char):
         return '\u0590' <= char <= '\u05FF'
 
+    def page_count(self):
+        with pdfplumber.open(self.pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def _parse_root(self, page):
+        """Returns the root found on an open pdfplumber page, or None if the page has no text."""
+        text = page.extract_text()
+        
+        if not text:
+            return None
+
+        lines = text.split('\n')
+        
+        # Check for Root
+        # Heuristic: Find line with "Racine" then next line is Root
+        for i, line in enumerate(lines):
+            if "Racine" in line:
+                if i + 1 < len(lines):
+                    raw_root = lines[i+1].strip()
+                    if any(self._is_hebrew(c) for c in raw_root):
+                        # Reverse the root string
+                        return self.reverse_hebrew(raw_root)
+                break
+        return ""
+
     def parse_page(self, page_num):
         """Parses a specific page and returns *only* the root."""
         results = {
@@ -24,26 +50,36 @@ class PDFParser:
                 if page_num >= len(pdf.pages):
                     return None
                 
-                page = pdf.pages[page_num]
-                text = page.extract_text()
-                
-                if not text:
+                root = self._parse_root(pdf.pages[page_num])
+                if root is None:
                     return None
-
-                lines = text.split('\n')
-                
-                # Check for Root
-                # Heuristic: Find line with "Racine" then next line is Root
-                for i, line in enumerate(lines):
-                    if "Racine" in line:
-                        if i + 1 < len(lines):
-                            raw_root = lines[i+1].strip()
-                            if any(self._is_hebrew(c) for c in raw_root):
-                                # Reverse the root string
-                                results["root"] = self.reverse_hebrew(raw_root)
-                        break
+                results["root"] = root
         except Exception as e:
             print(f"Error parsing PDF: {e}")
             return None
             
         return results
+
+    def iter_roots(self, start_page=0, end_page=None):
+        """
+        Yields (page_num, root, words) for every page with a root, opening the PDF only once.
+        Each page's cached chars/objects are released after use so memory stays flat.
+        """
+        with pdfplumber.open(self.pdf_path) as pdf:
+            if end_page is None or end_page > len(pdf.pages):
+                end_page = len(pdf.pages)
+
+            for page_num in range(start_page, end_page):
+                with span("parse_page", page=page_num) as record:
+                    page = pdf.pages[page_num]
+                    try:
+                        root = self._parse_root(page)
+                    except Exception as e:
+                        print(f"Error parsing PDF page {page_num + 1}: {e}")
+                        root = None
+                    finally:
+                        page.close()
+                    record["root"] = root
+
+                if root:
+                    yield page_num, root, []
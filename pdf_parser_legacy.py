@@ -1,86 +1,77 @@
 import pdfplumber
 import re
+import unicodedata
+
+# Combining marks (points, accents, dagesh...) of the Hebrew blocks, computed once
+_HEBREW_MARKS = frozenset(
+    chr(code) for code in list(range(0x0591, 0x05D0)) + list(range(0xFB1D, 0xFB50))
+    if unicodedata.combining(chr(code))
+)
+
+# Layout mode: chars within this fraction of the font size vertically share a row
+ROW_TOLERANCE = 0.5
+# Layout mode: a horizontal gap wider than this fraction of the font size starts a new word
+WORD_GAP = 0.25
+
+# Hebrew (Standard + Presentation Forms + Nikkud), separators (spaces and quotes) or anything else
+_LINE_TOKEN = re.compile(
+    r'(?P<hebrew>[\u0590-\u05FF\uFB1D-\uFB4F]+)'
+    r'|(?P<sep>[\s"]+)'
+    r'|(?P<latin>[^\u0590-\u05FF\uFB1D-\uFB4F\s"]+)'
+)
+
+def tokenize_line(line):
+    """Splits a line into ("hebrew" | "sep" | "latin", text) runs in a single pass."""
+    return [(m.lastgroup, m.group()) for m in _LINE_TOKEN.finditer(line)]
 
 class PDFParser:
-    def __init__(self, pdf_path):
+    def __init__(self, pdf_path, layout=False):
         self.pdf_path = pdf_path
+        # layout=True extracts entries from char boxes instead of extract_text() lines
+        self.layout = layout
 
     def reverse_hebrew(self, text):
-        import unicodedata
-        # Remove spaces between diacritics and letters if they exist?
-        # In the issue "מַ  ְהךָ", we see spaces. 
-        # Clean up spaces that might be artifacts between combining marks.
-        # But first, let's just reverse blindly and see if we can re-order.
-        # Actually, simpler approach for "Visual" Hebrew with diacritics:
-        # If the input is [LastChar] [Mark] [PrevChar] [Mark]...
-        # We want [FirstChar] [Mark] [NextChar] [Mark]...
-        
-        # 1. Reverse the string completely (chars).
-        # 2. But this puts marks *before* their base if they were *after* in visual? 
-        #    Note: in visual LTR, if I type "Shalom" RTL, I see "molahS".
-        #    If I have "Shin+Qamats", does it become "Qamats+Shin" (visual)? 
-        #    Usually PDF visual text is: [Shin] [Qamats] -> (extracts as) -> [Shin] [Qamats] if simple.
-        #    If reversed: [Qamats] [Shin]. This renders Qamats on the char *before* Shin (or dotted circle).
-        #    So we need [Shin] [Qamats].
-        #    This implies we should NOT reverse the [Char+Mark] cluster.
-        #    We should reverse the ORDER of the clusters.
-        
-        # My previous code did: Identify clusters, then reverse list of clusters.
-        # output: [Cluster3] [Cluster2] [Cluster1].
-        # Cluster = Base + Marks.
-        # This assumes the input `text` was [Cluster1] [Cluster2] [Cluster3] in REVERSE order?
-        # Input: `text` from pdfplumber. 
-        # If PDF is Visual LTR: "txeT werbeH"
-        # Cluster1 (Hebrew Start) is at the end of the string.
-        # So yes, reversing the list of clusters is correct.
-        
-        # The issue "מַ  ְהךָ" has spaces. 
-        # Input likely: `Kaf` `Space` `Qamats` ...
-        # My cluster logic: `current_cluster` = `Kaf`. Next char `Space`.
-        # `Space` is NOT combining. So `Kaf` is flushed.
-        # Next `Space`. Flushed.
-        # Next `Qamats` (Combining). Attached to... `Space`? Or new cluster?
-        # `unicodedata.combining(' ')` is 0.
-        # So `Qamats` starts new cluster (on dotted circle).
-        
-        # FIX: We need to ignore/merge spaces that separate a base and a mark.
-        
+        # PDF text is in visual order: the clusters (base char + its marks) come out
+        # last-to-first, but each cluster keeps its marks after the base.
+        # So we reverse the ORDER of the clusters, not the characters.
+        # Extraction also leaves spaces between a base and its mark (e.g. "מַ  ְהךָ"):
+        # a mark following a space replaces that space instead of sitting on it.
+        #
+        # Single pass over the input with a precomputed mark table; runs of two or
+        # more spaces are collapsed while the clusters are emitted in reverse.
         clusters = []
-        current_cluster = ""
-        
-        text = text.strip()
-        
-        # Pass 1: Remove spaces between Base and Mark?
-        # Regex: [Base] [Space] [Mark] -> [Base] [Mark]
-        # But we need to know what is Base and Mark.
-        
-        # Let's iterate.
-        for char in text:
-            is_combining = unicodedata.combining(char)
-            is_space = char.isspace()
-            
-            if is_combining:
-                # If current cluster ends with space, remove it?
-                if current_cluster and current_cluster[-1].isspace():
-                    current_cluster = current_cluster.rstrip()
-                current_cluster += char
+        for char in text.strip():
+            if char in _HEBREW_MARKS:
+                is_mark = True
+            elif char < '\u0300' or '\u05d0' <= char <= '\u05f4':
+                # Latin-1 and Hebrew letters/punctuation never combine
+                is_mark = False
             else:
-                if current_cluster:
-                     clusters.append(current_cluster)
-                current_cluster = char
-                
-        if current_cluster:
-            clusters.append(current_cluster)
-        
-        # Filter out purely whitespace clusters if they are noise?
-        # clusters = [c for c in clusters if c.strip()] 
-        
-        # Reverse
-        reversed_text = "".join(reversed(clusters))
-        
-        # Post-processing: Collapse multiple spaces
-        reversed_text = re.sub(r'\s{2,}', ' ', reversed_text)
-        return reversed_text.strip()
+                is_mark = unicodedata.combining(char) != 0
+
+            if not is_mark or not clusters:
+                clusters.append(char)
+            elif clusters[-1].isspace():
+                # Only a lone space can end a cluster: drop it
+                clusters[-1] = char
+            else:
+                clusters[-1] += char
+
+        out = []
+        spaces = 0
+        last_space = ''
+        for cluster in reversed(clusters):
+            if cluster.isspace():
+                spaces += 1
+                last_space = cluster
+                continue
+            if spaces:
+                # Leading spaces are dropped (strip); 2+ collapse to one
+                if out:
+                    out.append(' ' if spaces > 1 else last_space)
+                spaces = 0
+            out.append(cluster)
+        return ''.join(out)
 
     def _is_hebrew(self, char):
         # Include Presentation Forms A and B (FB1D-FB4F, FE70-FEFF check?)
@@ -89,117 +80,285 @@ class PDFParser:
         code = ord(char)
         return (0x0590 <= code <= 0x05FF) or (0xFB1D <= code <= 0xFB4F)
 
-    def parse_page(self, page_num):
-        """Parses a specific page (0-indexed) and returns the root and words."""
+    def _split_line(self, line):
+        """
+        Splits a line into (raw Hebrew, Latin part) from a single tokenizer pass.
+        Hebrew runs keep the spaces/quotes between them; those separators also
+        belong to the Latin part, like the old per-regex passes did.
+        """
+        hebrew = []
+        run = []
+        run_has_hebrew = False
+        latin = []
+        for kind, text in tokenize_line(line):
+            if kind == "latin":
+                if run_has_hebrew:
+                    hebrew.extend(run)
+                run = []
+                run_has_hebrew = False
+                latin.append(text)
+            elif kind == "sep":
+                run.append(text)
+                latin.append(text)
+            else:
+                run.append(text)
+                run_has_hebrew = True
+        if run_has_hebrew:
+            hebrew.extend(run)
+
+        # Also cleanup stray quotes/punctuation acting as Hebrew leftovers
+        return "".join(hebrew).strip(), " ".join("".join(latin).split())
+
+    def page_count(self):
+        with pdfplumber.open(self.pdf_path) as pdf:
+            return len(pdf.pages)
+
+    def _parse_pdf_page(self, page):
+        """Parses an open pdfplumber page and returns the root and words, or None."""
+        if self.layout:
+            return self._parse_pdf_page_layout(page)
+
         results = {
             "root": "",
             "words": []
         }
         
-        try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                if page_num >= len(pdf.pages):
-                    return None
-                
-                page = pdf.pages[page_num]
-                text = page.extract_text()
-                
-                if not text:
-                    return None
+        text = page.extract_text()
+        
+        if not text:
+            return None
 
-                lines = text.split('\n')
-                
-                # Check for Root
-                # Heuristic: Find line with "Racine" then next line is Root
-                root_found = False
-                for i, line in enumerate(lines):
-                    if "Racine" in line:
-                        if i + 1 < len(lines):
-                            raw_root = lines[i+1].strip()
-                            # Check if root line contains Hebrew
-                            if any(self._is_hebrew(c) for c in raw_root):
-                                results["root"] = self.reverse_hebrew(raw_root)
-                                root_found = True
-                        break
-                
-                if not root_found:
-                    # Fallback: maybe just look for the first Hebrew text?
-                    # But for now, rely on "Racine".
-                    return None
+        lines = text.split('\n')
+        
+        # Check for Root
+        # Heuristic: Find line with "Racine" then next line is Root
+        root_found = False
+        for i, line in enumerate(lines):
+            if "Racine" in line:
+                if i + 1 < len(lines):
+                    raw_root = lines[i+1].strip()
+                    # Check if root line contains Hebrew
+                    if any(self._is_hebrew(c) for c in raw_root):
+                        results["root"] = self.reverse_hebrew(raw_root)
+                        root_found = True
+                break
+        
+        if not root_found:
+            # Fallback: maybe just look for the first Hebrew text?
+            # But for now, rely on "Racine".
+            return None
 
-                # Extract Words with Grouping
-                # Group lines into entries
-                current_entry = {}
-                
-                for line in lines:
-                    line = line.strip()
-                    # Skip metadata
-                    if "Racine" in line or (root_found and line == results["root"][::-1]):
-                         continue
-                    if "Serge Frydman" in line:
-                        continue
-                    if not line:
-                        continue
-                    
-                    # Logic:
-                    # 1. Contains Latin + Hebrew: Start of new word (usually).
-                    # 2. Contains Hebrew Only: continuation (Plain Hebrew).
-                    # 3. Contains Latin Only: definition extension.
+        # Extract Words with Grouping
+        # Group lines into entries
+        results["words"] = self._group_entries(self._text_lines(lines, results["root"]))
+        return results
 
-                    has_hebrew = any(self._is_hebrew(c) for c in line)
-                    
-                    # Regex to remove Hebrew chars (Standard + Presentation Forms + Nikkud)
-                    # Range: \u0590-\u05FF and \uFB1D-\uFB4F
-                    latin_part = re.sub(r'[\u0590-\u05FF\uFB1D-\uFB4F]+', '', line).strip()
-                    # Also cleanup stray quotes/punctuation acting as Hebrew leftovers
-                    latin_part = re.sub(r'\s+', ' ', latin_part)
-                    
-                    # Extract raw Hebrew parts
-                    # Capture Standard, Presentation, and Nikkud (0591-05C7 are inside 0590-05FF)
-                    hebrew_matches = re.findall(r'[\u0590-\u05FF\uFB1D-\uFB4F\s"]+', line)
-                    
-                    full_hebrew_str = ""
-                    if has_hebrew:
-                        raw_hebw = "".join(match for match in hebrew_matches if any(self._is_hebrew(c) for c in match))
-                        full_hebrew_str = self.reverse_hebrew(raw_hebw.strip())
-
-                    if has_hebrew and latin_part:
-                        # New Entry
-                        if current_entry:
-                            results["words"].append(current_entry)
-                        current_entry = {
-                            "hebrew_vocalized": full_hebrew_str,
-                            "hebrew_plain": "", 
-                            "latin": latin_part,
-                            "description": latin_part
-                        }
-                    elif has_hebrew and not latin_part:
-                        # Likely the Plain Hebrew version of the previous entry
-                        # IGNORE if it's just a single char or noise (like stray vowel)
-                        if len(full_hebrew_str) <= 1:
-                            continue
-                            
-                        if current_entry:
-                             # Don't overwrite if we already have a long/good string
-                             if len(current_entry["hebrew_plain"]) > len(full_hebrew_str):
-                                 continue
-                             current_entry["hebrew_plain"] = full_hebrew_str
-                    elif not has_hebrew and latin_part:
-                        # Latin only - append to description
-                        if current_entry:
-                            current_entry["description"] += " " + latin_part
-                            current_entry["latin"] += " " + latin_part
+    def _text_lines(self, lines, root):
+        """Yields (hebrew, latin) for each content line of extract_text() output."""
+        for line in lines:
+            line = line.strip()
+            # Skip metadata
+            if "Racine" in line or line == root[::-1]:
+                 continue
+            if "Serge Frydman" in line:
+                continue
+            if not line:
+                continue
+
+            # One tokenizer pass gives both the raw Hebrew and the Latin part
+            raw_hebrew, latin_part = self._split_line(line)
+            
+            full_hebrew_str = ""
+            if raw_hebrew:
+                full_hebrew_str = self.reverse_hebrew(raw_hebrew)
+            yield full_hebrew_str, latin_part
+
+    def _group_entries(self, lines):
+        """Groups (hebrew, latin) lines into word entries."""
+        words = []
+        current_entry = {}
+        
+        for full_hebrew_str, latin_part in lines:
+            # Logic:
+            # 1. Contains Latin + Hebrew: Start of new word (usually).
+            # 2. Contains Hebrew Only: continuation (Plain Hebrew).
+            # 3. Contains Latin Only: definition extension.
+            has_hebrew = bool(full_hebrew_str)
 
+            if has_hebrew and latin_part:
+                # New Entry
                 if current_entry:
-                    results["words"].append(current_entry)
+                    words.append(current_entry)
+                current_entry = {
+                    "hebrew_vocalized": full_hebrew_str,
+                    "hebrew_plain": "", 
+                    "latin": latin_part,
+                    "description": latin_part
+                }
+            elif has_hebrew and not latin_part:
+                # Likely the Plain Hebrew version of the previous entry
+                # IGNORE if it's just a single char or noise (like stray vowel)
+                if len(full_hebrew_str) <= 1:
+                    continue
+                    
+                if current_entry:
+                     # Don't overwrite if we already have a long/good string
+                     if len(current_entry["hebrew_plain"]) > len(full_hebrew_str):
+                         continue
+                     current_entry["hebrew_plain"] = full_hebrew_str
+            elif not has_hebrew and latin_part:
+                # Latin only - append to description
+                if current_entry:
+                    current_entry["description"] += " " + latin_part
+                    current_entry["latin"] += " " + latin_part
+
+        if current_entry:
+            words.append(current_entry)
+        return words
+
+    def _parse_pdf_page_layout(self, page):
+        """
+        Layout mode: builds rows from pdfplumber's char boxes instead of extract_text().
+        Marks are attached to the base char they sit on and Hebrew is ordered
+        right-to-left by x position, so no reversal or per-line repair is needed.
+        """
+        rows = self._layout_rows(page)
+        if not rows:
+            return None
+
+        root_row = None
+        for i, (hebrew, latin) in enumerate(rows):
+            if "Racine" in latin:
+                if i + 1 < len(rows) and rows[i + 1][0]:
+                    root_row = i + 1
+                break
+        if root_row is None:
+            return None
+
+        content = [
+            (hebrew, latin) for i, (hebrew, latin) in enumerate(rows)
+            if i != root_row and "Racine" not in latin and "Serge Frydman" not in latin
+        ]
+        return {
+            "root": rows[root_row][0],
+            "words": self._group_entries(content)
+        }
+
+    def _layout_rows(self, page):
+        """Returns the page as a list of (hebrew, latin) rows, top to bottom."""
+        bases = []
+        marks = []
+        for char in page.chars:
+            if not char["text"].strip():
+                continue
+            # Ligatures ("ﬁ" -> "fi") come through as one char with several letters: always a base
+            if len(char["text"]) == 1 and (char["text"] in _HEBREW_MARKS or unicodedata.combining(char["text"])):
+                marks.append(char)
+            else:
+                bases.append(dict(char, marks=[]))
+
+        # Rows: bases whose vertical centres are within half a glyph of each other
+        rows = []
+        for char in sorted(bases, key=lambda c: (c["top"] + c["bottom"]) / 2):
+            middle = (char["top"] + char["bottom"]) / 2
+            if rows and middle - rows[-1]["middle"] <= ROW_TOLERANCE * char["size"]:
+                rows[-1]["chars"].append(char)
+            else:
+                rows.append({"middle": middle, "size": char["size"], "chars": [char]})
+
+        # Each mark goes to the base it overlaps horizontally, in the nearest row
+        for mark in marks:
+            center_x = (mark["x0"] + mark["x1"]) / 2
+            middle = (mark["top"] + mark["bottom"]) / 2
+            best = None
+            for row in rows:
+                distance = abs(row["middle"] - middle)
+                if distance > row["size"]:
+                    continue
+                for char in row["chars"]:
+                    if char["x0"] - 1 <= center_x <= char["x1"] + 1:
+                        key = (distance, abs((char["x0"] + char["x1"]) / 2 - center_x))
+                        if best is None or key < best[0]:
+                            best = (key, char)
+            if best:
+                best[1]["marks"].append(mark)
+            # A mark with no base under it is a stray and is dropped
+
+        return [self._layout_row_text(row["chars"]) for row in rows]
+
+    def _layout_row_text(self, chars):
+        """Splits one row into words by x gaps and script, then joins Hebrew RTL and Latin LTR."""
+        chars = sorted(chars, key=lambda c: c["x0"])
+        words = []
+        previous = None
+        for char in chars:
+            is_hebrew = self._is_hebrew(char["text"][0])
+            gap = previous is not None and char["x0"] - previous["x1"] > WORD_GAP * char["size"]
+            script_change = (
+                previous is not None and char["text"].isalpha() and previous["text"].isalpha()
+                and is_hebrew != self._is_hebrew(previous["text"][0])
+            )
+            if previous is None or gap or script_change:
+                words.append([])
+            words[-1].append(char)
+            previous = char
+
+        hebrew_words = []
+        latin_words = []
+        for word in words:
+            if any(self._is_hebrew(c["text"][0]) for c in word):
+                hebrew_words.append(word)
+            else:
+                latin_words.append("".join(c["text"] for c in word))
+
+        # Right-to-left: rightmost word first, rightmost char first within it
+        hebrew = " ".join(
+            "".join(
+                c["text"] + "".join(m["text"] for m in sorted(c["marks"], key=lambda m: unicodedata.combining(m["text"])))
+                for c in reversed(word)
+            )
+            for word in reversed(hebrew_words)
+        )
+        return hebrew, " ".join(latin_words)
+
+    def parse_page(self, page_num):
+        """Parses a specific page (0-indexed) and returns the root and words."""
+        try:
+            with pdfplumber.open(self.pdf_path) as pdf:
+                if page_num >= len(pdf.pages):
+                    return None
+                
+                return self._parse_pdf_page(pdf.pages[page_num])
 
         except Exception as e:
             # write error to file to see it
             with open("parse_error.txt", "w") as f:
                 f.write(str(e))
             return None
-            
-        return results
+
+    def iter_roots(self, start_page=0, end_page=None):
+        """
+        Yields (page_num, root, words) for every page with a root, opening the PDF only once.
+        Each page's cached chars/objects are released after use so memory stays flat.
+        """
+        with pdfplumber.open(self.pdf_path) as pdf:
+            if end_page is None or end_page > len(pdf.pages):
+                end_page = len(pdf.pages)
+
+            for page_num in range(start_page, end_page):
+                page = pdf.pages[page_num]
+                try:
+                    data = self._parse_pdf_page(page)
+                except Exception as e:
+                    with open("parse_error.txt", "w") as f:
+                        f.write(f"Page {page_num + 1}: {e}")
+                    data = None
+                finally:
+                    page.close()
+
+                if data and data["root"]:
+                    yield page_num, data["root"], data["words"]
+
 
 if __name__ == "__main__":
     parser = PDFParser("roots.pdf")
@@ -0,0 +1,90 @@
+import random
+import threading
+import time
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` acquisitions per `per` seconds,
+    with bursts of up to `capacity` (defaults to `rate`).
+    """
+    def __init__(self, rate, per=60.0, capacity=None):
+        self.rate = float(rate)
+        self.per = float(per)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """Blocks until `tokens` are available, then takes them."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) * self.per / self.rate
+            time.sleep(wait)
+
+    def drain(self):
+        """Empties the bucket, e.g. after the server reports a rate limit."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+def backoff_delay(attempt, base=1.0, cap=60.0):
+    """Full-jitter exponential backoff delay (seconds) for a 0-based retry attempt."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for a while.
+    After `failure_threshold` consecutive failures the circuit opens and allow() returns False;
+    after `reset_timeout` seconds one trial call is let through (half-open): a success closes
+    the circuit again, a failure re-opens it.
+    """
+    def __init__(self, failure_threshold=3, reset_timeout=300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "half-open":
+                # Let a single trial through; the others wait for its outcome
+                self.opened_at = time.monotonic()
+                return True
+            return state == "closed"
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+    def trip(self):
+        """Opens the circuit immediately (e.g. the model does not exist)."""
+        with self._lock:
+            self.failures = max(self.failures, self.failure_threshold)
+            self.opened_at = time.monotonic()
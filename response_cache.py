@@ -0,0 +1,100 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+
+CACHE_FILE = "enrich_cache.json"
+
+def atomic_write_json(file_path, data, **kwargs):
+    """Writes JSON to a temp file in the same directory, then renames it over file_path."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, **kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class ResponseCache:
+    """
+    Small on-disk key/value cache with LRU eviction and an optional TTL (seconds).
+    Entries are kept in recency order (oldest first) so eviction pops from the front.
+    Reads only reorder entries in memory; the new order is written with the next set()
+    or by flush(), which also runs at interpreter exit.
+    """
+    def __init__(self, file_path=CACHE_FILE, max_entries=500, ttl=None):
+        self.file_path = file_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.entries = self._load_entries()
+        # True when reads changed the recency order since the last save
+        self._dirty = False
+        atexit.register(self.flush)
+
+    def _load_entries(self):
+        if not os.path.exists(self.file_path):
+            return {}
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    @staticmethod
+    def make_key(*parts):
+        return "|".join(str(p) for p in parts)
+
+    def save(self):
+        atomic_write_json(self.file_path, self.entries)
+        self._dirty = False
+
+    def flush(self):
+        """Writes recency changes from get() that have not been saved yet."""
+        with self._lock:
+            if self._dirty:
+                self.save()
+
+    def _expired(self, entry):
+        return self.ttl is not None and time.time() - entry["created"] > self.ttl
+
+    def get(self, key):
+        """Returns the cached value, or None on a miss or an expired entry."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry):
+                del self.entries[key]
+                self._dirty = True
+                return None
+
+            # Mark as most recently used (in memory only, a hit does not rewrite the file)
+            del self.entries[key]
+            entry["accessed"] = time.time()
+            self.entries[key] = entry
+            self._dirty = True
+            return entry["value"]
+
+    def set(self, key, value):
+        with self._lock:
+            now = time.time()
+            self.entries.pop(key, None)
+            self.entries[key] = {"value": value, "created": now, "accessed": now}
+
+            # Evict least recently used entries
+            while len(self.entries) > self.max_entries:
+                del self.entries[next(iter(self.entries))]
+            self.save()
+
+    def invalidate(self, key):
+        with self._lock:
+            if self.entries.pop(key, None) is not None:
+                self.save()
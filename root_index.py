@@ -0,0 +1,150 @@
+import bisect
+import hashlib
+import json
+import os
+
+from root_keys import RootTrie
+
+INDEX_FILE = "root_index.json"
+INDEX_VERSION = 1
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def fingerprint(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime": st.st_mtime, "sha256": file_hash(path)}
+
+def fingerprint_matches(path, source):
+    """
+    Checks a file against a stored fingerprint.
+    Size and mtime are compared first; the hash is only computed when the
+    mtime differs (e.g. after a fresh checkout on CI). Same content with a new
+    mtime still matches, and the new mtime is written into `source`.
+    """
+    if not os.path.exists(path):
+        return False
+    st = os.stat(path)
+    if st.st_size != source.get("size"):
+        return False
+    if st.st_mtime == source.get("mtime"):
+        return True
+    if file_hash(path) != source.get("sha256"):
+        return False
+    source["mtime"] = st.st_mtime
+    return True
+
+class RootIndex:
+    """
+    On-disk index of every page's root and entries in the roots PDF.
+    Built once, then reused until the PDF's size/mtime/hash changes.
+    """
+    def __init__(self, pdf_path, index_path=INDEX_FILE):
+        self.pdf_path = pdf_path
+        self.index_path = index_path
+        self.data = self._load_index()
+        self.pages = {int(k): v for k, v in self.data.get("pages", {}).items()}
+        self._sorted_pages = sorted(self.pages)
+        self._trie = None
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+    def is_valid(self):
+        """Checks the index against the PDF's size, mtime and (when the mtime differs) hash."""
+        if self.data.get("version") != INDEX_VERSION:
+            return False
+
+        source = self.data.get("source", {})
+        mtime = source.get("mtime")
+        if not fingerprint_matches(self.pdf_path, source):
+            return False
+        if source["mtime"] != mtime:
+            # Same content, new mtime: remember it so the next check stays cheap
+            self.save()
+        return True
+
+    def save(self):
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, separators=(",", ":"))
+
+    def build(self, parser=None, workers=1):
+        """
+        Extracts every page once and writes the index.
+        Defaults to the legacy parser, which also returns the page entries;
+        workers > 1 spreads the extraction over a process pool.
+        """
+        if parser is None:
+            from extraction import extract_document
+            from pdf_parser_legacy import PDFParser
+            page_count = PDFParser(self.pdf_path).page_count()
+            extracted = extract_document(self.pdf_path, workers=workers, legacy=True)
+        else:
+            page_count = parser.page_count()
+            extracted = parser.iter_roots(0)
+
+        pages = {}
+        for page_num, root, words in extracted:
+            pages[page_num] = {"root": root, "words": words}
+
+        self.data = {
+            "version": INDEX_VERSION,
+            "source": fingerprint(self.pdf_path),
+            "page_count": page_count,
+            "pages": {str(k): v for k, v in pages.items()},
+        }
+        self.pages = pages
+        self._sorted_pages = sorted(pages)
+        self._trie = None
+        self.save()
+        print(f"RootIndex: Indexed {len(pages)} roots from {page_count} pages.")
+
+    def get(self, page_num):
+        return self.pages.get(page_num)
+
+    def page_count(self):
+        return self.data.get("page_count", 0)
+
+    def find_roots(self, prefix):
+        """Returns {page_num: root} for indexed roots with an alternate starting with `prefix`."""
+        if self._trie is None:
+            self._trie = RootTrie(data["root"] for data in self.pages.values())
+            self._pages_by_root = {}
+            for page_num, data in self.pages.items():
+                self._pages_by_root.setdefault(data["root"], []).append(page_num)
+
+        found = {}
+        for root in self._trie.starts_with(prefix):
+            for page_num in self._pages_by_root[root]:
+                found[page_num] = root
+        return dict(sorted(found.items()))
+
+    def next_root(self, start_page, is_used=None):
+        """
+        Returns (page_num, data) for the first indexed page >= start_page whose
+        root is not used, or (None, None) if there is none.
+        """
+        i = bisect.bisect_left(self._sorted_pages, start_page)
+        for page_num in self._sorted_pages[i:]:
+            data = self.pages[page_num]
+            if is_used and is_used(data["root"]):
+                continue
+            return page_num, data
+        return None, None
+
+if __name__ == "__main__":
+    index = RootIndex("roots.pdf")
+    if index.is_valid():
+        print(f"Index is up to date ({len(index.pages)} roots).")
+    else:
+        index.build(workers=os.cpu_count() or 1)
@@ -0,0 +1,83 @@
+import re
+
+# Final letter forms map to their regular letters so "פ.ע.ם" and "פ.ע.מ" compare equal
+FINAL_FORMS = str.maketrans("ךםןףץ", "כמנפצ")
+
+# Alternates are written as "נ.ט.ה / נ.ט.י", "ר.י.ק - ר.ק.ן" or "ע.ו.ה/י"
+ALTERNATE_SEPARATORS = re.compile(r'[/\-]')
+# A parenthesised root names a different, related root (the source of "ת.מ.צ.ת )מ.צ.י(" or
+# "ג.ב.ר )ת.ג.ב.ר("), not a spelling variant, so it is left out of the keys.
+# Parentheses come out mirrored from the PDF, so both orientations are accepted.
+RELATED_ROOT = re.compile(r'[()][^()]*[()]')
+
+def _letters(text):
+    return tuple(c for c in text if 'א' <= c <= 'ת')
+
+def canonical_root_keys(root):
+    """
+    Returns the canonical letter tuples of a root string, one per alternate.
+    e.g. "ע.ו.ה/י" -> [('ע', 'ו', 'ה'), ('ע', 'ו', 'י')], "ת.מ.צ.ת )מ.צ.י(" -> [('ת', 'מ', 'צ', 'ת')]
+    """
+    keys = []
+    base = None
+    main_root = RELATED_ROOT.sub(" ", root.translate(FINAL_FORMS))
+    for part in ALTERNATE_SEPARATORS.split(main_root):
+        letters = _letters(part)
+        if not letters:
+            continue
+        if base and len(letters) < len(base) and "." not in part:
+            # Undotted shorthand ("ה/י"): replaces the last letters of the previous form
+            letters = base[:len(base) - len(letters)] + letters
+        else:
+            base = letters
+        if letters not in keys:
+            keys.append(letters)
+    return keys
+
+def canonical_prefix(prefix):
+    """Canonical letters of a (possibly dotted) prefix such as "ה.פ" or "הפ"."""
+    return _letters(prefix.translate(FINAL_FORMS))
+
+class RootTrie:
+    """
+    Index of roots by their canonical keys.
+    Exact lookups are a hash hit per alternate; prefix queries walk the trie.
+    """
+    def __init__(self, roots=()):
+        self.keys = {}
+        self.children = {}
+        for root in roots:
+            self.add(root)
+
+    def add(self, root):
+        for key in canonical_root_keys(root):
+            self.keys.setdefault(key, set()).add(root)
+            node = self.children
+            for letter in key:
+                node = node.setdefault(letter, {})
+            node.setdefault(None, set()).add(root)
+
+    def contains(self, root):
+        """True if any alternate of `root` matches any alternate of an indexed root."""
+        return any(key in self.keys for key in canonical_root_keys(root))
+
+    __contains__ = contains
+
+    def starts_with(self, prefix):
+        """Returns the indexed roots having an alternate that starts with `prefix`."""
+        node = self.children
+        for letter in canonical_prefix(prefix):
+            node = node.get(letter)
+            if node is None:
+                return set()
+
+        found = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for letter, child in node.items():
+                if letter is None:
+                    found.update(child)
+                else:
+                    stack.append(child)
+        return found
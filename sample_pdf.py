@@ -0,0 +1,134 @@
+import itertools
+import sys
+import unicodedata
+
+# Pages laid out like roots.pdf: "Racine" label with the root below it (stored visually, i.e.
+# reversed), French/transliteration entries on the left and pointed Hebrew on the right
+SAMPLE_ENTRIES = [
+    ("ה.פ.כ", [("renverser lahafokhe", "לַהֲפֹךְ"), ("contraire hafoukhe", "הָפוּךְ"), ("révolution mahapekhah", "מַהְפֵּכָה")]),
+    ("ר.ג.ז", [("colère roguèze", "רֹגֶז"), ("s'énerver lirgoze", "לִרְגֹּז")]),
+    ("ת.ח.ל", [("début hateh'alah", "הַתְחָלָה"), ("commencer lehateh'il", "לְהַתְחִיל")]),
+    ("ש.מ.ר", [("garder lichmor", "לִשְׁמֹר"), ("gardien chomère", "שׁוֹמֵר"), ("conservé, conﬁé chamour", "שָׁמוּר")]),
+    ("כ.ת.ב", [("écrire likhtove", "לִכְתֹּב"), ("lettre mikhtave", "מִכְתָּב")]),
+]
+
+LETTERS = "אבגדהוזחטיכלמנסעפצקרשת"
+FOOTER = "Serge Frydman - Ort Villiers"
+# Ligature glyphs, extracted as several letters ("ﬁ" -> "fi") like in the French text of roots.pdf
+LIGATURES = {"\ufb01": "fi", "\ufb02": "fl"}
+
+def _line(x, y, text, size=12):
+    items = []
+    for c in text:
+        items.append((x, y, LIGATURES.get(c, c), size))
+        if not unicodedata.combining(c):
+            x += size * 0.5
+    return items
+
+def _hebrew_line(x, y, text, size=12):
+    # Visual order: clusters (base letter + its marks) reversed, marks drawn over their base
+    clusters = []
+    for c in text:
+        if unicodedata.combining(c) and clusters:
+            clusters[-1] += c
+        else:
+            clusters.append(c)
+    items = []
+    for cluster in reversed(clusters):
+        items.append((x, y, cluster[0], size))
+        for mark in cluster[1:]:
+            items.append((x + 1, y, mark, size))
+        x += size * 0.5
+    return items
+
+def page_items(root, entries):
+    items = _line(250, 800, "Racine", 14)
+    items += _line(260, 780, root[::-1], 14)
+    y = 750
+    for latin, hebrew in entries:
+        items += _line(50, y, latin)
+        items += _hebrew_line(400, y, hebrew)
+        y -= 20
+    items += _line(50, 40, FOOTER, 8)
+    return items
+
+def sample_pages(page_count):
+    """
+    Deterministic page contents: the sample roots first, then synthetic three-letter roots
+    reusing the sample entries. Every 50th page is blank, like the PDF's section breaks.
+    """
+    synthetic = (".".join(letters) for letters in itertools.permutations(LETTERS, 3))
+    pages = []
+    for i in range(page_count):
+        if i % 50 == 49:
+            pages.append([])
+            continue
+        root, entries = SAMPLE_ENTRIES[i % len(SAMPLE_ENTRIES)]
+        if i >= len(SAMPLE_ENTRIES):
+            root = next(synthetic)
+        pages.append(page_items(root, entries))
+    return pages
+
+def build_pdf(path, pages):
+    """
+    Writes a minimal PDF with one Type0 (Identity-H) font and a ToUnicode map, so pdfplumber
+    extracts the exact characters. `pages` is a list of [(x, y, char, size), ...]; a "char"
+    of several letters is one glyph (a ligature).
+    """
+    codes = {}
+    streams = []
+    for items in pages:
+        ops = ["BT"]
+        for x, y, c, size in items:
+            code = codes.setdefault(c, len(codes) + 1)
+            ops.append(f"/F1 {size} Tf 1 0 0 1 {x:.2f} {y:.2f} Tm <{code:04X}> Tj")
+        ops.append("ET")
+        streams.append("\n".join(ops).encode("ascii"))
+
+    # Marks have no advance width so they stack on their base letter
+    widths = " ".join(f"{code} [{0 if len(c) == 1 and unicodedata.combining(c) else 500}]" for c, code in codes.items())
+    cmap = ["/CIDInit /ProcSet findresource begin 12 dict begin begincmap",
+            "/CMapName /Sample def 1 begincodespacerange <0000> <FFFF> endcodespacerange",
+            f"{len(codes)} beginbfchar"]
+    cmap += [f"<{code:04X}> <{''.join(f'{ord(u):04X}' for u in c)}>" for c, code in codes.items()]
+    cmap.append("endbfchar endcmap CMapName currentdict /CMap defineresource pop end end")
+    cmap = "\n".join(cmap).encode("ascii")
+
+    # 1 catalog, 2 page tree, 3-6 font objects, then a (page, content) pair per page
+    kids = " ".join(f"{7 + 2 * i} 0 R" for i in range(len(pages)))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode("ascii"),
+        b"<< /Type /Font /Subtype /Type0 /BaseFont /Sample /Encoding /Identity-H /DescendantFonts [4 0 R] /ToUnicode 6 0 R >>",
+        (f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /Sample /CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) "
+         f"/Supplement 0 >> /FontDescriptor 5 0 R /DW 500 /W [{widths}] >>").encode("ascii"),
+        (b"<< /Type /FontDescriptor /FontName /Sample /Flags 32 /FontBBox [0 -200 1000 800] /ItalicAngle 0 "
+         b"/Ascent 800 /Descent -200 /CapHeight 700 /StemV 80 >>"),
+        b"<< /Length %d >>\nstream\n" % len(cmap) + cmap + b"\nendstream",
+    ]
+    for i, stream in enumerate(streams):
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents {8 + 2 * i} 0 R >>".encode("ascii"))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(out))
+        out += f"{i + 1} 0 obj\n".encode("ascii") + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("ascii")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii")
+    with open(path, "wb") as f:
+        f.write(out)
+
+def generate(path, page_count=20):
+    build_pdf(path, sample_pages(page_count))
+    return path
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "sample.pdf"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    generate(path, count)
+    print(f"Wrote {count} pages to {path}")
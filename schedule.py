@@ -0,0 +1,104 @@
+import bisect
+import json
+import os
+import sys
+import time
+
+from response_cache import atomic_write_json
+from root_index import fingerprint, fingerprint_matches
+from root_keys import RootTrie
+
+SCHEDULE_FILE = "schedule.json"
+# 3: related roots in parentheses no longer make a later page a duplicate
+SCHEDULE_VERSION = 3
+
+class Schedule:
+    """
+    The whole course planned up front: one (day, page, root) entry per distinct root, in page order.
+    Pages without a parseable root and repeats of an earlier root (any spelling variant) are dropped,
+    so the daily run only has to take the next entry after the last page sent.
+    """
+    def __init__(self, file_path=SCHEDULE_FILE):
+        self.file_path = file_path
+        self.data = self._load_schedule()
+        self.entries = self.data.get("entries", [])
+        self._pages = [entry["page"] for entry in self.entries]
+
+    def _load_schedule(self):
+        if not os.path.exists(self.file_path):
+            return {}
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+    def build(self, pdf_path, workers=1, root_index=None):
+        """
+        Walks every page of the PDF once and writes the schedule.
+        A valid RootIndex is reused instead of re-reading the PDF.
+        """
+        if root_index is not None and root_index.is_valid():
+            page_count = root_index.page_count()
+            pages = [(page_num, root_index.get(page_num)["root"]) for page_num in sorted(root_index.pages)]
+        else:
+            from extraction import extract_document
+            from pdf_parser import PDFParser
+            page_count = PDFParser(pdf_path).page_count()
+            pages = [(page_num, root) for page_num, root, _ in extract_document(pdf_path, workers=workers)]
+
+        seen = RootTrie()
+        entries = []
+        duplicates = 0
+        for page_num, root in pages:
+            if not root:
+                continue
+            if seen.contains(root):
+                duplicates += 1
+                continue
+            seen.add(root)
+            entries.append({"day": len(entries) + 1, "page": page_num, "root": root})
+
+        self.data = {
+            "version": SCHEDULE_VERSION,
+            "source": fingerprint(pdf_path),
+            "built_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "entries": entries,
+        }
+        self.entries = entries
+        self._pages = [entry["page"] for entry in entries]
+        atomic_write_json(self.file_path, self.data, indent=1)
+        unparsed = page_count - len(entries) - duplicates
+        print(f"Schedule: {len(entries)} days planned from {page_count} pages "
+              f"({duplicates} duplicate roots and {unparsed} pages without a root dropped).")
+
+    def is_current(self, pdf_path):
+        """True if a schedule exists and was built from this PDF (same fingerprint as RootIndex uses)."""
+        if self.data.get("version") != SCHEDULE_VERSION or not self.entries:
+            return False
+        source = self.data.get("source", {})
+        mtime = source.get("mtime")
+        if not fingerprint_matches(pdf_path, source):
+            return False
+        if source["mtime"] != mtime:
+            # Same content, new mtime (fresh checkout): keep the next check cheap
+            atomic_write_json(self.file_path, self.data, indent=1)
+        return True
+
+    def next_entry(self, start_page, is_used=None):
+        """
+        Returns the first entry on a page >= start_page whose root is not used, or None
+        once the schedule is finished.
+        """
+        i = bisect.bisect_left(self._pages, start_page)
+        for entry in self.entries[i:]:
+            if is_used and is_used(entry["root"]):
+                continue
+            return entry
+        return None
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    schedule = Schedule()
+    for entry in schedule.entries:
+        print(f"Day {entry['day']}: page {entry['page'] + 1} - {entry['root']}")
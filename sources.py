@@ -0,0 +1,187 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from http_cache import HttpCache, CacheMiss
+import html_parsing
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_TIMEOUT = 10
+
+class HttpClient:
+    """
+    Pooled keep-alive HTTP session shared by all dictionary sources.
+    With an HttpCache, fresh entries are served from disk and stale ones are revalidated.
+    """
+    def __init__(self, pool_size=8, session=None, cache=None):
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+        self.session = session
+        self.cache = cache
+
+    def get(self, url, timeout=DEFAULT_TIMEOUT):
+        """Returns the body of a successful GET; raises on network errors and non-2xx statuses."""
+        entry = None
+        headers = {}
+        if self.cache:
+            entry = self.cache.load(url)
+            if entry and (self.cache.offline or self.cache.is_fresh(entry)):
+                return entry["body"]
+            if self.cache.offline:
+                raise CacheMiss(f"Offline and not cached: {url}")
+            headers = self.cache.conditional_headers(entry)
+
+        response = self.session.get(url, timeout=timeout, headers=headers)
+        if response.status_code == 304 and entry:
+            self.cache.touch(url, entry)
+            return entry["body"]
+        response.raise_for_status()
+        if self.cache:
+            self.cache.store(url, response.text, response.headers)
+        return response.text
+
+class Source:
+    """
+    A dictionary website. Subclasses build the lookup URL for a word and parse the page
+    into a list of dicts; the HTTP client is shared between sources.
+    """
+    name = ""
+    timeout = DEFAULT_TIMEOUT
+    # SoupStrainer for the part of the page parse() reads (None parses the whole document)
+    strainer = None
+
+    def __init__(self, client):
+        self.client = client
+
+    def url(self, word):
+        raise NotImplementedError
+
+    def parse(self, html):
+        raise NotImplementedError
+
+    def soup(self, html):
+        return html_parsing.make_soup(html, self.strainer)
+
+    def lookup(self, word):
+        return self.parse(self.client.get(self.url(word), timeout=self.timeout))
+
+class PealimSource(Source):
+    """Pealim search: conjugated dictionary entries (lemma, part of speech, meaning)."""
+    name = "pealim"
+    strainer = html_parsing.PEALIM_RESULTS
+
+    def url(self, word):
+        # Root format: ה.פ.כ -> Pealim search works with the bare letters
+        return f"https://www.pealim.com/search/?q={quote(word.replace('.', ''))}"
+
+    def parse(self, html):
+        soup = self.soup(html)
+        entries = []
+        for result in soup.find_all('div', class_='verb-search-result'):
+            lemma = result.find('span', class_='menukad')
+            binyan = result.find('div', class_='verb-search-binyan')
+            meaning = result.find('div', class_='verb-search-meaning')
+            if binyan and binyan.find('span', class_='verb-search-label'):
+                binyan.find('span', class_='verb-search-label').extract()
+            entries.append({
+                "hebrew": lemma.get_text(strip=True) if lemma else "",
+                "type": binyan.get_text(" ", strip=True) if binyan else "",
+                "translation": meaning.get_text(" ", strip=True) if meaning else ""
+            })
+        return entries
+
+class MilogSource(Source):
+    """Milog: Hebrew-Hebrew dictionary definitions."""
+    name = "milog"
+    strainer = html_parsing.MILOG_DEFINITIONS
+
+    def url(self, word):
+        return f"https://milog.co.il/{quote(word)}"
+
+    def parse(self, html):
+        soup = self.soup(html)
+        # Milog definitions
+        # <div class="sr_e_txt">...</div>
+        return [{"definition": d.get_text(strip=True)} for d in soup.find_all('div', class_='sr_e_txt')]
+
+class ReversoSource(Source):
+    """Reverso Context: Hebrew/English example sentence pairs."""
+    name = "reverso"
+    timeout = 15
+    strainer = html_parsing.REVERSO_EXAMPLES
+
+    def url(self, word):
+        return f"https://context.reverso.net/translation/hebrew-english/{quote(word)}"
+
+    def parse(self, html):
+        soup = self.soup(html)
+        examples = []
+        # Examples usually in div class="example"
+        for ex in soup.find_all('div', class_='example'):
+            src = ex.find('div', class_='src')
+            trg = ex.find('div', class_='trg')
+            examples.append({
+                "hebrew": src.get_text(strip=True) if src else "",
+                "english": trg.get_text(strip=True) if trg else ""
+            })
+        return examples
+
+class TatoebaSource(Source):
+    """Tatoeba: Hebrew sentences with their translations."""
+    name = "tatoeba"
+    timeout = 15
+    strainer = html_parsing.TATOEBA_SENTENCES
+
+    def url(self, word):
+        return f"https://tatoeba.org/en/sentences/search?query={quote(word)}&from=heb&to=eng"
+
+    def parse(self, html):
+        soup = self.soup(html)
+        sentences = []
+        # Tatoeba structure: div class="sentence-and-translations"
+        # The main sentence is the first div class="text", translations follow in div class="translation"
+        for s in soup.find_all('div', class_='sentence-and-translations'):
+            heb_div = s.find('div', class_='text')
+            translations = []
+            for t in s.find_all('div', class_='translation'):
+                t_text = t.find('div', class_='text')
+                if t_text:
+                    translations.append(t_text.get_text(strip=True))
+            sentences.append({
+                "hebrew": heb_div.get_text(strip=True) if heb_div else "",
+                "translations": translations
+            })
+        return sentences
+
+DEFAULT_SOURCES = [PealimSource, MilogSource, ReversoSource, TatoebaSource]
+
+def make_sources(client=None, source_classes=DEFAULT_SOURCES):
+    client = client or HttpClient(pool_size=len(source_classes) * 2, cache=HttpCache())
+    return [cls(client) for cls in source_classes]
+
+def lookup_all(word, sources):
+    """
+    Queries every source for `word` concurrently, so the total time is that of the slowest one.
+    Returns {source name: list of results}; a failed source maps to an error string.
+    """
+    def lookup(source):
+        try:
+            return source.lookup(word)
+        except Exception as e:
+            return f"LookupError: {e}"
+
+    with ThreadPoolExecutor(max_workers=max(1, len(sources))) as executor:
+        results = executor.map(lookup, sources)
+        return {source.name: result for source, result in zip(sources, results)}
+
+if __name__ == "__main__":
+    import json
+    sys.stdout.reconfigure(encoding='utf-8')
+    word = sys.argv[1] if len(sys.argv) > 1 else "להתחיל"
+    print(json.dumps(lookup_all(word, make_sources()), indent=2, ensure_ascii=False))
@@ -1,5 +1,8 @@
 import json
 import os
+import sqlite3
+import time
+from root_keys import RootTrie, canonical_root_keys, canonical_prefix
 
 HISTORY_FILE = "history.json"
 
@@ -7,6 +10,8 @@ class StateManager:
     def __init__(self, file_path=HISTORY_FILE):
         self.file_path = file_path
         self.history = self._load_history()
+        # Canonical-key index so spelling variants of a used root are recognised
+        self.root_trie = RootTrie(self.history["used_roots"])
 
     def _load_history(self):
         if not os.path.exists(self.file_path):
@@ -22,7 +27,11 @@ class StateManager:
             json.dump(self.history, f, indent=2, ensure_ascii=False)
 
     def is_root_used(self, root):
-        return root in self.history["used_roots"]
+        return self.root_trie.contains(root)
+
+    def find_used_roots(self, prefix):
+        """Used roots with an alternate starting with the given letters."""
+        return self.root_trie.starts_with(prefix)
 
     def is_page_used(self, page_num):
         return page_num in self.history["used_pages"]
@@ -30,6 +39,7 @@ class StateManager:
     def mark_used(self, root, page_num):
         if root and root not in self.history["used_roots"]:
             self.history["used_roots"].append(root)
+            self.root_trie.add(root)
         if page_num not in self.history["used_pages"]:
             self.history["used_pages"].append(page_num)
         self.save_history()
@@ -38,3 +48,141 @@ class StateManager:
         if not self.history["used_pages"]:
             return -1
         return max(self.history["used_pages"])
+
+STATE_DB = "history.db"
+# Stored in PRAGMA user_version; 1 = root_keys indexed for every chat,
+# 2 = parenthesised related roots no longer indexed as alternates
+SCHEMA_VERSION = 2
+
+class SQLiteStateManager:
+    """
+    Same interface as StateManager, backed by indexed SQLite tables.
+    Lookups are primary-key/index hits and mark_used only writes the new rows.
+    State is kept per chat; chat_id=None is the shared (single chat) history.
+    """
+    def __init__(self, db_path=STATE_DB, chat_id=None):
+        self.db_path = db_path
+        self.chat_id = str(chat_id) if chat_id is not None else ""
+        self.conn = sqlite3.connect(db_path)
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS used_roots (
+                chat TEXT NOT NULL,
+                root TEXT NOT NULL,
+                page INTEGER,
+                used_at REAL,
+                PRIMARY KEY (chat, root)
+            );
+            CREATE TABLE IF NOT EXISTS root_keys (
+                chat TEXT NOT NULL,
+                key TEXT NOT NULL,
+                root TEXT NOT NULL,
+                PRIMARY KEY (chat, key, root)
+            );
+            CREATE TABLE IF NOT EXISTS used_pages (
+                chat TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                root TEXT,
+                used_at REAL,
+                PRIMARY KEY (chat, page)
+            );
+        """)
+        self.conn.commit()
+
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            # Databases from before root_keys, or indexed by older key rules (wrong chat,
+            # related roots as alternates): rebuild the index from used_roots, per chat
+            rows = self.conn.execute("SELECT chat, root FROM used_roots").fetchall()
+            with self.conn:
+                self.conn.execute("DELETE FROM root_keys")
+                for chat, root in rows:
+                    self._add_root_keys([root], chat)
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _add_root_keys(self, roots, chat=None):
+        chat = self.chat_id if chat is None else chat
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO root_keys (chat, key, root) VALUES (?, ?, ?)",
+            [(chat, "".join(key), root) for root in roots for key in canonical_root_keys(root)]
+        )
+
+    def is_root_used(self, root):
+        keys = ["".join(key) for key in canonical_root_keys(root)]
+        if not keys:
+            return False
+        placeholders = ", ".join("?" * len(keys))
+        row = self.conn.execute(
+            f"SELECT 1 FROM root_keys WHERE chat = ? AND key IN ({placeholders}) LIMIT 1", (self.chat_id, *keys)
+        ).fetchone()
+        return row is not None
+
+    def find_used_roots(self, prefix):
+        """Used roots with an alternate starting with the given letters (an index range scan)."""
+        start = "".join(canonical_prefix(prefix))
+        rows = self.conn.execute(
+            "SELECT DISTINCT root FROM root_keys WHERE chat = ? AND key >= ? AND key < ?",
+            (self.chat_id, start, start + "\uffff")
+        )
+        return {row[0] for row in rows}
+
+    def is_page_used(self, page_num):
+        row = self.conn.execute(
+            "SELECT 1 FROM used_pages WHERE chat = ? AND page = ?", (self.chat_id, page_num)
+        ).fetchone()
+        return row is not None
+
+    def mark_used(self, root, page_num):
+        now = time.time()
+        with self.conn:
+            if root:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO used_roots (chat, root, page, used_at) VALUES (?, ?, ?, ?)",
+                    (self.chat_id, root, page_num, now)
+                )
+                self._add_root_keys([root])
+            self.conn.execute(
+                "INSERT OR IGNORE INTO used_pages (chat, page, root, used_at) VALUES (?, ?, ?, ?)",
+                (self.chat_id, page_num, root, now)
+            )
+
+    def get_last_page(self):
+        # MAX over the (chat, page) primary key is a single index seek
+        row = self.conn.execute(
+            "SELECT MAX(page) FROM used_pages WHERE chat = ?", (self.chat_id,)
+        ).fetchone()
+        return row[0] if row[0] is not None else -1
+
+    def close(self):
+        self.conn.close()
+
+def migrate_history(json_path=HISTORY_FILE, db_path=STATE_DB, chat_id=None):
+    """One-shot import of an existing history.json into the SQLite backend."""
+    history = StateManager(json_path).history
+    roots = history.get("used_roots", [])
+    pages = history.get("used_pages", [])
+    # The JSON lists are appended together, so when their lengths match they line up
+    aligned = len(roots) == len(pages)
+
+    state = SQLiteStateManager(db_path, chat_id)
+    with state.conn:
+        state.conn.executemany(
+            "INSERT OR IGNORE INTO used_roots (chat, root, page, used_at) VALUES (?, ?, ?, NULL)",
+            [(state.chat_id, root, pages[i] if aligned else None) for i, root in enumerate(roots)]
+        )
+        state.conn.executemany(
+            "INSERT OR IGNORE INTO used_pages (chat, page, root, used_at) VALUES (?, ?, ?, NULL)",
+            [(state.chat_id, page, roots[i] if aligned else None) for i, page in enumerate(pages)]
+        )
+        state._add_root_keys(roots)
+    print(f"Migrated {len(roots)} roots and {len(pages)} pages from {json_path} to {db_path}.")
+    return state
+
+def open_state_manager(backend=None, chat_id=None):
+    """Returns the state backend selected by `backend` or the STATE_BACKEND env var (json/sqlite)."""
+    backend = backend or os.environ.get("STATE_BACKEND", "json")
+    if backend == "sqlite":
+        return SQLiteStateManager(chat_id=chat_id)
+    return StateManager()
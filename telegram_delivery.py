@@ -0,0 +1,107 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limit import TokenBucket, backoff_delay
+from telemetry import span
+
+TELEGRAM_API = "https://api.telegram.org/bot{token}/sendMessage"
+
+# Telegram bot limits: about 30 messages per second overall and 1 per second per chat
+GLOBAL_RATE = 30
+PER_CHAT_RATE = 1
+
+class TelegramDelivery:
+    """
+    Sends messages to many chats over a shared keep-alive session.
+    Sends run concurrently but are throttled to Telegram's global and per-chat limits;
+    429 responses are retried after the `retry_after` Telegram asks for.
+    """
+    def __init__(self, token, max_workers=16, timeout=10, max_retries=3, session=None):
+        self.url = TELEGRAM_API.format(token=token)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = session or self._make_session(max_workers)
+        self.global_bucket = TokenBucket(GLOBAL_RATE, per=1.0)
+        self.chat_buckets = {}
+        self._lock = threading.Lock()
+
+    def _make_session(self, pool_size):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        return session
+
+    def _chat_bucket(self, chat_id):
+        with self._lock:
+            if chat_id not in self.chat_buckets:
+                self.chat_buckets[chat_id] = TokenBucket(PER_CHAT_RATE, per=1.0)
+            return self.chat_buckets[chat_id]
+
+    def send(self, chat_id, text, parse_mode="Markdown"):
+        """
+        Sends one message. Returns {"chat_id", "ok", "attempts", "error", "retryable"};
+        retryable is False when resending can never succeed (a 4xx other than 429).
+        """
+        payload = {
+            "chat_id": chat_id,
+            "text": text,
+            "parse_mode": parse_mode
+        }
+        error = None
+        attempts = self.max_retries + 1
+        for attempt in range(1, attempts + 1):
+            self._chat_bucket(chat_id).acquire()
+            self.global_bucket.acquire()
+            try:
+                with span("telegram_post", chat_id=chat_id, attempt=attempt) as record:
+                    response = self.session.post(self.url, json=payload, timeout=self.timeout)
+                    record["status"] = response.status_code
+            except requests.RequestException as e:
+                error = str(e)
+                if attempt < attempts:
+                    time.sleep(backoff_delay(attempt - 1))
+                continue
+
+            if response.status_code == 200:
+                return {"chat_id": chat_id, "ok": True, "attempts": attempt, "error": None, "retryable": False}
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            error = body.get("description") or f"HTTP {response.status_code}"
+
+            if response.status_code != 429 and response.status_code < 500:
+                # Other 4xx (bad chat id, blocked bot, bad markup): retrying won't help
+                return {"chat_id": chat_id, "ok": False, "attempts": attempt, "error": error, "retryable": False}
+            if attempt == attempts:
+                # Out of retries: no point waiting before giving up
+                break
+            if response.status_code == 429:
+                retry_after = body.get("parameters", {}).get("retry_after", 1)
+                print(f"Telegram: Rate limited for chat {chat_id}, retrying in {retry_after}s...")
+                time.sleep(retry_after)
+            else:
+                time.sleep(backoff_delay(attempt - 1))
+
+        return {"chat_id": chat_id, "ok": False, "attempts": attempt, "error": error, "retryable": True}
+
+    def broadcast(self, chat_ids, text, parse_mode="Markdown"):
+        """Sends the same message to every chat concurrently. Returns {chat_id: result}."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Worker threads don't inherit the caller's context: copy it so telegram_post spans
+            # keep the bound page/root (one copy per task, a context can't be entered twice at once)
+            futures = {
+                chat_id: executor.submit(contextvars.copy_context().run, self.send, chat_id, text, parse_mode)
+                for chat_id in chat_ids
+            }
+            for chat_id, future in futures.items():
+                results[chat_id] = future.result()
+        return results
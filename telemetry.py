@@ -0,0 +1,58 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# One JSON object per line; set TELEMETRY_FILE="" to turn telemetry off
+TELEMETRY_FILE = "telemetry.jsonl"
+
+# Identifies the spans of one process run when the file accumulates across runs
+RUN_ID = uuid.uuid4().hex[:12]
+
+# Attributes (page, root, model, ...) inherited by every span opened inside bind()/span()
+_fields = contextvars.ContextVar("telemetry_fields", default={})
+_lock = threading.Lock()
+
+def _file_path():
+    return os.environ.get("TELEMETRY_FILE", TELEMETRY_FILE)
+
+def emit(record):
+    file_path = _file_path()
+    if not file_path:
+        return
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _lock:
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+@contextmanager
+def bind(**attrs):
+    """Attaches attributes to every span opened inside the block (in this thread)."""
+    token = _fields.set({**_fields.get(), **attrs})
+    try:
+        yield
+    finally:
+        _fields.reset(token)
+
+@contextmanager
+def span(name, **attrs):
+    """
+    Times the block and writes one JSON line:
+    {"run", "ts", "span", <bound attributes>, <attrs>, "duration_ms"[, "error"]}.
+    The yielded dict can be updated inside the block (e.g. record["model"] = ...).
+    """
+    record = {"run": RUN_ID, "ts": round(time.time(), 3), "span": name, **_fields.get(), **attrs}
+    token = _fields.set({**_fields.get(), **attrs})
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _fields.reset(token)
+        record["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        emit(record)
@@ -1,22 +1,18 @@
-import requests
 from bs4 import BeautifulSoup
+from sources import HttpClient, PealimSource
 
 def test_pealim(root):
-    # Root format: ה.פ.כ -> need to strip dots for some searches or keep them?
-    # Pealim search usually works with letters.
-    query = root.replace(".", "")
-    url = f"https://www.pealim.com/search/?q={query}"
+    source = PealimSource(HttpClient())
+    url = source.url(root)
     with open("scrape_result.txt", "w", encoding="utf-8") as f:
         f.write(f"Testing URL: {url}\n")
         try:
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            r = requests.get(url, headers=headers)
-            f.write(f"Status: {r.status_code}\n")
-            if r.status_code == 200:
-                soup = BeautifulSoup(r.text, 'html.parser')
-                f.write(f"Title: {soup.title.string}\n")
-                with open("pealim.html", "w", encoding="utf-8") as html_f:
-                    html_f.write(soup.prettify())
+            html = source.client.get(url, timeout=source.timeout)
+            soup = BeautifulSoup(html, 'html.parser')
+            f.write(f"Title: {soup.title.string}\n")
+            f.write(f"Found {len(source.parse(html))} entries.\n")
+            with open("pealim.html", "w", encoding="utf-8") as html_f:
+                html_f.write(soup.prettify())
         except Exception as e:
             f.write(f"Error: {e}\n")
 